@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Tarefa:
+    """Unidade de trabalho: ``funcao`` recebe os resultados das ``dependencias``, na ordem declarada."""
+
+    def __init__(self, nome, funcao, dependencias=()):
+        self.nome = nome
+        self.funcao = funcao
+        self.dependencias = tuple(dependencias)
+
+
+def ordem_topologica(tarefas):
+    """Nomes das tarefas em ordem topológica; ValueError para nomes repetidos, dependências desconhecidas ou ciclos."""
+    por_nome = {}
+    for tarefa in tarefas:
+        if tarefa.nome in por_nome:
+            raise ValueError(f"Tarefa repetida: '{tarefa.nome}'.")
+        por_nome[tarefa.nome] = tarefa
+
+    faltando = {}
+    dependentes = defaultdict(list)
+    for tarefa in tarefas:
+        for dep in tarefa.dependencias:
+            if dep not in por_nome:
+                raise ValueError(f"A tarefa '{tarefa.nome}' depende de '{dep}', que não existe.")
+            dependentes[dep].append(tarefa.nome)
+        faltando[tarefa.nome] = len(set(tarefa.dependencias))
+
+    ordem = [nome for nome, n in faltando.items() if n == 0]
+    for nome in ordem:
+        for dep in dependentes[nome]:
+            faltando[dep] -= 1
+            if faltando[dep] == 0:
+                ordem.append(dep)
+    if len(ordem) < len(por_nome):
+        ciclo = sorted(nome for nome, n in faltando.items() if n > 0)
+        raise ValueError(f"Dependências circulares entre as tarefas: {', '.join(ciclo)}.")
+    return ordem
+
+
+def _cronometrar(funcao, argumentos):
+    inicio = time.perf_counter()
+    resultado = funcao(*argumentos)
+    return resultado, time.perf_counter() - inicio
+
+
+def executar_tarefas(tarefas, max_workers=None):
+    """
+    Executa as tarefas num pool de threads, cada uma assim que todas as suas
+    dependências terminam. Tarefas independentes rodam em paralelo no mesmo processo
+    e compartilham os objetos produzidos (ex.: o grafo construído uma única vez).
+
+    Se uma tarefa falha, as que dependem dela (direta ou indiretamente) não são
+    executadas; as demais seguem normalmente.
+
+    Retorna (resultados, tempos, erros): dicionários por nome de tarefa, com o valor
+    retornado, a duração em segundos e a exceção (para as que falharam ou foram puladas).
+    """
+    ordem_topologica(tarefas)
+    por_nome = {t.nome: t for t in tarefas}
+    faltando = {t.nome: set(t.dependencias) for t in tarefas}
+    dependentes = defaultdict(list)
+    for tarefa in tarefas:
+        for dep in set(tarefa.dependencias):
+            dependentes[dep].append(tarefa.nome)
+
+    resultados, tempos, erros = {}, {}, {}
+
+    def pular_dependentes(nome):
+        for dep in dependentes[nome]:
+            if dep not in erros:
+                erros[dep] = RuntimeError(f"Não executada: a dependência '{nome}' falhou.")
+                pular_dependentes(dep)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        em_execucao = {}
+
+        def submeter(nome):
+            tarefa = por_nome[nome]
+            argumentos = [resultados[d] for d in tarefa.dependencias]
+            em_execucao[executor.submit(_cronometrar, tarefa.funcao, argumentos)] = nome
+
+        for nome, deps in faltando.items():
+            if not deps:
+                submeter(nome)
+
+        while em_execucao:
+            concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                nome = em_execucao.pop(futuro)
+                try:
+                    resultados[nome], tempos[nome] = futuro.result()
+                except Exception as erro:
+                    erros[nome] = erro
+                    pular_dependentes(nome)
+                    continue
+                for dep in dependentes[nome]:
+                    faltando[dep].discard(nome)
+                    if not faltando[dep] and dep not in erros:
+                        submeter(dep)
+
+    return resultados, tempos, erros
+
+
+def caminho_critico(tarefas, tempos):
+    """(duração, [nomes]) da cadeia de dependências mais longa, segundo os ``tempos`` medidos."""
+    por_nome = {t.nome: t for t in tarefas}
+    fim = {}
+    anterior = {}
+    for nome in ordem_topologica(tarefas):
+        inicio = 0.0
+        for dep in por_nome[nome].dependencias:
+            if fim[dep] > inicio:
+                inicio = fim[dep]
+                anterior[nome] = dep
+        fim[nome] = inicio + tempos.get(nome, 0.0)
+    if not fim:
+        return 0.0, []
+    ultimo = max(fim, key=fim.get)
+    cadeia = [ultimo]
+    while cadeia[-1] in anterior:
+        cadeia.append(anterior[cadeia[-1]])
+    return fim[ultimo], cadeia[::-1]
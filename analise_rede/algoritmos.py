@@ -4,6 +4,13 @@ import math
 import random
 from collections import deque
 
+import numpy as np
+
+from .bfs import BuscaEmLargura, resumo_distancias
+from .concorrencia import consultar_em_paralelo
+from .csr import GrafoCSR
+from .persistencia import carregar_checkpoint, impressao_digital, salvar_checkpoint
+
 def count_strongly_connected_components(graph):
     """Conta SCCs e retorna a contagem e a distribuição de seus tamanhos."""
     index = 0
@@ -47,6 +54,18 @@ def count_strongly_connected_components(graph):
 
 def count_connected_components(graph):
     """Conta componentes conexas e retorna a contagem e a distribuição de seus tamanhos."""
+    if isinstance(graph, GrafoCSR):
+        # Uma BFS do kernel vetorizado por componente; os buffers não são limpos entre
+        # as buscas, então vértices já visitados não são explorados de novo.
+        busca = BuscaEmLargura(graph)
+        component_sizes = []
+        for i in range(len(graph)):
+            if busca.dist[i] >= 0:
+                continue
+            niveis = busca.executar(i)
+            component_sizes.append(sum(len(nivel) for nivel in niveis))
+        return len(component_sizes), component_sizes
+
     visited = set()
     component_sizes = []
     for v in graph:
@@ -74,18 +93,22 @@ def prim_mst_for_vertex(graph, X):
         raise ValueError(f"Vértice {X} não existe no grafo.")
     
     # Primeiro, encontra todos os vértices na mesma componente
-    visited = set()
-    component_vertices = set()
-    stack = [X]
-    visited.add(X)
-    
-    while stack:
-        u = stack.pop()
-        component_vertices.add(u)
-        for v in graph.get(u, {}):
-            if v not in visited:
-                visited.add(v)
-                stack.append(v)
+    if isinstance(graph, GrafoCSR):
+        niveis = BuscaEmLargura(graph).distancias(graph.indice[X])
+        component_vertices = {graph.vertices[i] for i in np.concatenate(niveis).tolist()}
+    else:
+        visited = set()
+        component_vertices = set()
+        stack = [X]
+        visited.add(X)
+
+        while stack:
+            u = stack.pop()
+            component_vertices.add(u)
+            for v in graph.get(u, {}):
+                if v not in visited:
+                    visited.add(v)
+                    stack.append(v)
     
     # Agora executa Prim apenas na componente
     if len(component_vertices) <= 1:
@@ -146,47 +169,60 @@ def betweenness_centrality(graph, v):
     
     # Para grafos muito grandes, limitamos o número de vértices fonte
     max_sources = min(100, N)  # Limita a 100 vértices fonte para performance
-    
-    for s in nodes[:max_sources]:
-        if s == v:
-            continue
+
+    if isinstance(graph, GrafoCSR):
+        busca = BuscaEmLargura(graph)
+        for s in nodes[:max_sources]:
+            if s == v:
+                continue
+            i = graph.indice[s]
+            niveis = busca.dependencias(i)
+            betw += float(busca.delta[np.concatenate(niveis)].sum() - busca.delta[i])
+            busca.limpar(niveis)
+    else:
+        for s in nodes[:max_sources]:
+            if s == v:
+                continue
             
-        # BFS para caminhos mais curtos (sem pesos)
-        queue = deque([s])
-        dist = {u: float('inf') for u in graph}
-        dist[s] = 0
-        sigma = {u: 0 for u in graph}
-        sigma[s] = 1
-        P = {u: [] for u in graph}
+            # BFS para caminhos mais curtos (sem pesos)
+            queue = deque([s])
+            dist = {u: float('inf') for u in graph}
+            dist[s] = 0
+            sigma = {u: 0 for u in graph}
+            sigma[s] = 1
+            P = {u: [] for u in graph}
         
-        while queue:
-            u = queue.popleft()
-            for w in graph[u]:
-                if dist[w] == float('inf'):
-                    dist[w] = dist[u] + 1
-                    queue.append(w)
-                if dist[w] == dist[u] + 1:
-                    sigma[w] += sigma[u]
-                    P[w].append(u)
+            while queue:
+                u = queue.popleft()
+                for w in graph[u]:
+                    if dist[w] == float('inf'):
+                        dist[w] = dist[u] + 1
+                        queue.append(w)
+                    if dist[w] == dist[u] + 1:
+                        sigma[w] += sigma[u]
+                        P[w].append(u)
         
-        # Acumula dependências
-        delta = {u: 0.0 for u in graph}
-        stack = [u for u in graph if dist[u] != float('inf')]
-        stack.sort(key=lambda x: dist[x], reverse=True)
+            # Acumula dependências
+            delta = {u: 0.0 for u in graph}
+            stack = [u for u in graph if dist[u] != float('inf')]
+            stack.sort(key=lambda x: dist[x], reverse=True)
         
-        for w in stack:
-            for u in P[w]:
-                delta[u] += (sigma[u] / sigma[w]) * (1 + delta[w])
-            if w != s:
-                betw += delta[w]
-    
+            for w in stack:
+                for u in P[w]:
+                    delta[u] += (sigma[u] / sigma[w]) * (1 + delta[w])
+                if w != s:
+                    betw += delta[w]
+
     # Normalização
     if max_sources < N:
         # Ajusta para o número total de vértices
         betw = betw * (N / max_sources)
     
     # Detecta se é não-direcionado
-    undirected = all(u in graph[w] for u in graph for w in graph[u])
+    if isinstance(graph, GrafoCSR):
+        undirected = graph.eh_simetrico()
+    else:
+        undirected = all(u in graph[w] for u in graph for w in graph[u])
     if undirected:
         betw /= 2.0
     
@@ -198,8 +234,12 @@ def betweenness_centrality(graph, v):
     return betw / norm if norm > 0 else 0.0
 
 
-def closeness_centrality(graph, v):
-    """Centralidade de proximidade normalizada de ``v`` em ``[0, 1]``."""
+def closeness_centrality(graph, v, indice=None):
+    """
+    Centralidade de proximidade normalizada de ``v`` em ``[0, 1]``.
+    Se ``indice`` (um ``RotulosPLL`` construído sobre ``graph``) for dado, as
+    distâncias vêm dos rótulos em vez de uma BFS.
+    """
     if v not in graph:
         raise ValueError(f"Vértice {v} não existe no grafo.")
 
@@ -207,21 +247,33 @@ def closeness_centrality(graph, v):
     if N <= 1:
         return 0.0
 
-    # BFS não ponderado para obter distâncias mínimas
-    dist = {u: -1 for u in graph}
-    dist[v] = 0
-    queue = deque([v])
-    reachable = 1
-
-    while queue:
-        u = queue.popleft()
-        for w in graph[u]:
-            if dist[w] == -1:
-                dist[w] = dist[u] + 1
-                queue.append(w)
-                reachable += 1
-
-    total_dist = sum(d for d in dist.values() if d > 0)
+    if indice is not None:
+        reachable, total_dist = indice.resumo_a_partir_de(v)
+    elif isinstance(graph, GrafoCSR):
+        # BFS pelo kernel vetorizado
+        reachable, total_dist = resumo_distancias(BuscaEmLargura(graph).distancias(graph.indice[v]))
+    else:
+        # BFS não ponderado para obter distâncias mínimas
+        dist = {u: -1 for u in graph}
+        dist[v] = 0
+        queue = deque([v])
+        reachable = 1
+
+        while queue:
+            u = queue.popleft()
+            for w in graph[u]:
+                if dist[w] == -1:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+                    reachable += 1
+
+        total_dist = sum(d for d in dist.values() if d > 0)
+
+    return _proximidade(reachable, total_dist, N)
+
+
+def _proximidade(reachable, total_dist, N):
+    """Closeness a partir do número de alcançáveis (incluindo v) e da soma das distâncias."""
     if total_dist <= 0:
         return 0.0
 
@@ -248,6 +300,18 @@ def approx_betweenness_centrality(graph, v, k=50, seed=42):
     fontes = random.sample(nodes, min(k, N))
     accum = 0.0
 
+    if isinstance(graph, GrafoCSR):
+        busca = BuscaEmLargura(graph)
+        iv = graph.indice[v]
+        for s in fontes:
+            if s == v:
+                continue
+            niveis = busca.dependencias(graph.indice[s])
+            accum += float(busca.delta[iv])
+            busca.limpar(niveis)
+        norm = (N - 1) * (N - 2) / 2
+        return (accum * N / len(fontes)) / norm
+
     for s in fontes:
         if s == v:
             continue
@@ -294,36 +358,49 @@ def approx_betweenness_centrality_all(graph, k=50, seed=42):
 
     random.seed(seed)
     fontes = random.sample(nodes, min(k, N))
-    betw = {v: 0.0 for v in nodes}
-
-    undirected = all(u in graph[w] for u in graph for w in graph[u])
 
-    for s in fontes:
-        dist = {v: -1 for v in nodes}
-        sigma = {v: 0 for v in nodes}
-        P = {v: [] for v in nodes}
-        dist[s] = 0
-        sigma[s] = 1
-        queue = deque([s])
-        order = []
-
-        while queue:
-            v = queue.popleft()
-            order.append(v)
-            for w in graph[v]:
-                if dist[w] < 0:
-                    dist[w] = dist[v] + 1
-                    queue.append(w)
-                if dist[w] == dist[v] + 1:
-                    sigma[w] += sigma[v]
-                    P[w].append(v)
-
-        delta = {v: 0.0 for v in nodes}
-        for w in reversed(order):
-            for u in P[w]:
-                delta[u] += (sigma[u] / sigma[w]) * (1 + delta[w])
-            if w != s:
-                betw[w] += delta[w]
+    if isinstance(graph, GrafoCSR):
+        busca = BuscaEmLargura(graph)
+        acumulado = np.zeros(N)
+        for s in fontes:
+            i = graph.indice[s]
+            niveis = busca.dependencias(i)
+            busca.delta[i] = 0.0
+            visitados = np.concatenate(niveis)
+            acumulado[visitados] += busca.delta[visitados]
+            busca.limpar(niveis)
+        betw = dict(zip(nodes, acumulado.tolist()))
+        undirected = graph.eh_simetrico()
+    else:
+        betw = {v: 0.0 for v in nodes}
+        undirected = all(u in graph[w] for u in graph for w in graph[u])
+
+        for s in fontes:
+            dist = {v: -1 for v in nodes}
+            sigma = {v: 0 for v in nodes}
+            P = {v: [] for v in nodes}
+            dist[s] = 0
+            sigma[s] = 1
+            queue = deque([s])
+            order = []
+
+            while queue:
+                v = queue.popleft()
+                order.append(v)
+                for w in graph[v]:
+                    if dist[w] < 0:
+                        dist[w] = dist[v] + 1
+                        queue.append(w)
+                    if dist[w] == dist[v] + 1:
+                        sigma[w] += sigma[v]
+                        P[w].append(v)
+
+            delta = {v: 0.0 for v in nodes}
+            for w in reversed(order):
+                for u in P[w]:
+                    delta[u] += (sigma[u] / sigma[w]) * (1 + delta[w])
+                if w != s:
+                    betw[w] += delta[w]
 
     norm = (N - 1) * (N - 2)
     if undirected:
@@ -363,9 +440,22 @@ def top_betweenness_directors(graph, diretores, top_n=10, sample=50, seed=42, pl
     return ordenado
 
 #questao 5 do relatorio
-def top_closeness_directors(graph, diretores, top_n=10, plot=True):
-    """Retorna e opcionalmente plota os diretores mais centrais por closeness."""
-    cc = {d: closeness_centrality(graph, d) for d in diretores if d in graph}
+def top_closeness_directors(graph, diretores, top_n=10, plot=True, max_workers=None):
+    """
+    Retorna e opcionalmente plota os diretores mais centrais por closeness.
+    Com ``max_workers`` > 1, as BFS dos diretores são distribuídas num pool de
+    threads sobre um snapshot congelado do grafo.
+    """
+    if max_workers is not None and max_workers > 1:
+        N = len(graph)
+        presentes = [d for d in diretores if d in graph]
+        cc = consultar_em_paralelo(
+            graph, presentes,
+            lambda busca, i: _proximidade(*resumo_distancias(busca.distancias(i)), N),
+            max_workers=max_workers,
+        )
+    else:
+        cc = {d: closeness_centrality(graph, d) for d in diretores if d in graph}
     ordenado = sorted(cc.items(), key=lambda x: x[1], reverse=True)[:top_n]
     if plot:
         _plot_bar_chart(ordenado, "Top Closeness Centrality (Diretores)")
@@ -409,55 +499,57 @@ def calcular_centralidades_de_grau_em_lote(grafo):
         
     return centralidades
 
-def calcular_centralidades_de_intermediacao_aprox(grafo, k=100, semente=42):
-    
-    random.seed(semente)
+def calcular_centralidades_de_intermediacao_aprox(grafo, k=100, semente=42, caminho_checkpoint=None, tamanho_lote=10):
+    """
+    Betweenness aproximada de todos os vértices a partir de k fontes amostradas.
+    Com ``caminho_checkpoint``, o progresso é salvo a cada ``tamanho_lote`` fontes e
+    uma nova execução sobre o mesmo grafo e parâmetros continua de onde parou.
+    """
     vertices = grafo.obter_vertices()
     num_vertices = len(vertices)
-    
-    # Seleciona uma amostra de k vértices para usar como fontes
-    if k > num_vertices:
-        fontes = vertices
-    else:
-        fontes = random.sample(vertices, k)
-    
-    intermediacao = {v: 0.0 for v in vertices}
 
-    for s in fontes:
-        # Etapa 1: BFS para encontrar caminhos mais curtos
-        pilha = []
-        predecessores = {v: [] for v in vertices}
-        sigma = {v: 0.0 for v in vertices}
-        sigma[s] = 1.0
-        distancia = {v: -1 for v in vertices}
-        distancia[s] = 0
-        fila = deque([s])
-
-        while fila:
-            v = fila.popleft()
-            pilha.append(v)
-
-            for w in grafo.obter_vizinhos(v):
-                if distancia[w] < 0:
-                    fila.append(w)
-                    distancia[w] = distancia[v] + 1
-                
-                if distancia[w] == distancia[v] + 1:
-                    sigma[w] += sigma[v]
-                    predecessores[w].append(v)
-        
-        # Etapa 2: Acumular dependências
-        delta = {v: 0.0 for v in vertices}
-        while pilha:
-            w = pilha.pop()
-            for v_pred in predecessores[w]:
-                # O fator de divisão sigma[w] não pode ser zero
-                if sigma[w] != 0:
-                    fator = (sigma[v_pred] / sigma[w])
-                    delta[v_pred] += fator * (1 + delta[w])
-            
-            if w != s:
-                intermediacao[w] += delta[w]
+    estado = None
+    if caminho_checkpoint is not None:
+        impressao = impressao_digital(grafo.obter_lista_adj())
+        # "formato" 2: intermediação parcial em ndarray (checkpoints antigos guardavam um dicionário)
+        parametros = {"funcao": "intermediacao_aprox", "k": k, "semente": semente, "formato": 2}
+        estado = carregar_checkpoint(caminho_checkpoint, impressao, parametros)
+
+    if estado is not None:
+        fontes = estado["fontes"]
+        intermediacao = estado["intermediacao"]
+        inicio = estado["proxima_fonte"]
+        print(f"Retomando do checkpoint: {inicio}/{len(fontes)} fontes já processadas.")
+    else:
+        random.seed(semente)
+        # Seleciona uma amostra de k vértices para usar como fontes
+        if k > num_vertices:
+            fontes = vertices
+        else:
+            fontes = random.sample(vertices, k)
+        intermediacao = np.zeros(num_vertices)
+        inicio = 0
+
+    # BFS + acumulação de dependências (Brandes) pelo kernel vetorizado sobre o CSR
+    csr = grafo.obter_csr()
+    busca = BuscaEmLargura(csr)
+
+    for i in range(inicio, len(fontes)):
+        if caminho_checkpoint is not None and i > inicio and i % tamanho_lote == 0:
+            salvar_checkpoint(caminho_checkpoint, impressao, parametros,
+                              {"fontes": fontes, "intermediacao": intermediacao, "proxima_fonte": i})
+        s = csr.indice[fontes[i]]
+        niveis = busca.dependencias(s)
+        busca.delta[s] = 0.0
+        visitados = np.concatenate(niveis)
+        intermediacao[visitados] += busca.delta[visitados]
+        busca.limpar(niveis)
+
+    if caminho_checkpoint is not None:
+        salvar_checkpoint(caminho_checkpoint, impressao, parametros,
+                          {"fontes": fontes, "intermediacao": intermediacao, "proxima_fonte": len(fontes)})
+
+    intermediacao = dict(zip(csr.vertices, intermediacao.tolist()))
 
     # Normalização final
     if num_vertices > 2:
@@ -470,41 +562,57 @@ def calcular_centralidades_de_intermediacao_aprox(grafo, k=100, semente=42):
     
     return intermediacao
 
-def calcular_centralidades_de_proximidade_em_lote(grafo):
-
+def calcular_centralidades_de_proximidade_em_lote(grafo, indice=None, caminho_checkpoint=None, tamanho_lote=1000):
+    """
+    Centralidade de proximidade exata de todos os vértices (uma BFS por vértice).
+    Com ``caminho_checkpoint``, os resultados parciais são salvos a cada ``tamanho_lote``
+    vértices e uma nova execução sobre o mesmo grafo continua de onde parou.
+    """
     centralidades = {}
     todos_os_vertices = grafo.obter_vertices()
     num_vertices_total = len(todos_os_vertices)
 
     if num_vertices_total <= 1:
         return {}
-    
+
+    if caminho_checkpoint is not None:
+        impressao = impressao_digital(grafo.obter_lista_adj())
+        parametros = {"funcao": "proximidade"}
+        estado = carregar_checkpoint(caminho_checkpoint, impressao, parametros)
+        if estado is not None:
+            centralidades = estado
+            print(f"Retomando do checkpoint: {len(centralidades)}/{num_vertices_total} vértices já calculados.")
+
     print("Iniciando cálculo exato de Centralidade de Proximidade...")
-    
+
+    pendentes = [v for v in todos_os_vertices if v not in centralidades]
+    ja_calculados = num_vertices_total - len(pendentes)
+
+    if indice is None:
+        csr = grafo.obter_csr()
+        busca = BuscaEmLargura(csr)
+
     # Loop principal que executa a BFS para cada nó
-    for i, vertice in enumerate(todos_os_vertices):
+    for i, vertice in enumerate(pendentes):
+        if caminho_checkpoint is not None and i > 0 and i % tamanho_lote == 0:
+            salvar_checkpoint(caminho_checkpoint, impressao, parametros, centralidades)
+
         # --- Indicador de Progresso ---
         # Imprime o progresso na mesma linha para não poluir o console
-        progresso = (i + 1) / num_vertices_total * 100
-        print(f"\rCalculando... {progresso:.2f}% concluído ({i+1}/{num_vertices_total})", end="")
+        feitos = ja_calculados + i + 1
+        progresso = feitos / num_vertices_total * 100
+        print(f"\rCalculando... {progresso:.2f}% concluído ({feitos}/{num_vertices_total})", end="")
 
         # Etapa 1: BFS para encontrar distâncias a partir do 'vertice' atual
-        distancia = {vertice: 0}
-        fila = deque([vertice])
-        soma_distancias = 0
-        
-        while fila:
-            u = fila.popleft()
-            soma_distancias += distancia[u]
-            
-            for v_vizinho in grafo.obter_vizinhos(u):
-                if v_vizinho not in distancia:
-                    distancia[v_vizinho] = distancia[u] + 1
-                    fila.append(v_vizinho)
-        
+        # (ou consulta aos rótulos do índice PLL, se houver)
+        if indice is not None:
+            num_alcalcaveis, soma_distancias = indice.resumo_a_partir_de(vertice)
+        else:
+            niveis = busca.distancias(csr.indice[vertice])
+            num_alcalcaveis, soma_distancias = resumo_distancias(niveis)
+
         # Etapa 2: Cálculo da centralidade para o 'vertice'
-        num_alcalcaveis = len(distancia)
-        
+
         if soma_distancias == 0 or num_alcalcaveis <= 1:
             centralidades[vertice] = 0.0
             continue
@@ -515,5 +623,8 @@ def calcular_centralidades_de_proximidade_em_lote(grafo):
         
         centralidades[vertice] = proximidade_bruta * fator_alcance
 
+    if caminho_checkpoint is not None:
+        salvar_checkpoint(caminho_checkpoint, impressao, parametros, centralidades)
+
     print("\nCálculo de Proximidade finalizado.")
     return centralidades
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+def _posicoes(indptr, vs):
+    """Posições, em ``indices``, de todas as entradas das linhas ``vs`` (concatenadas) e o tamanho de cada linha."""
+    inicios = indptr[vs]
+    tamanhos = indptr[vs + 1] - inicios
+    total = int(tamanhos.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), tamanhos
+    deslocamento = np.repeat(inicios - (np.cumsum(tamanhos) - tamanhos), tamanhos)
+    return deslocamento + np.arange(total), tamanhos
+
+
+class BuscaEmLargura:
+    """
+    Kernel de BFS com otimização de direção (top-down / bottom-up) sobre um ``GrafoCSR``.
+
+    Cada nível é expandido de forma vetorizada. Enquanto a fronteira é pequena,
+    a expansão é top-down (vizinhos de saída da fronteira); quando as arestas da
+    fronteira passam de 1/``alfa`` das arestas ainda não exploradas, a busca passa
+    para bottom-up: cada vértice não visitado procura, entre seus vizinhos de
+    entrada, algum que esteja na fronteira. Volta para top-down quando a fronteira
+    cai abaixo de n/``beta`` vértices (heurística de Beamer et al.).
+
+    Os buffers ``dist``, ``sigma`` e ``delta`` têm o tamanho do grafo e são
+    reaproveitados entre buscas: depois de usar o resultado, chame ``limpar(niveis)``,
+    que custa apenas o número de vértices visitados. Cada instância serve a uma
+    thread por vez.
+    """
+
+    def __init__(self, csr, alfa=14.0, beta=24.0):
+        self.csr = csr
+        self.n = len(csr)
+        self.alfa = alfa
+        self.beta = beta
+        self.indptr = np.asarray(csr.indptr)
+        self.indices = np.asarray(csr.indices)
+        entrada = csr.entrada()
+        self.ent_indptr = np.asarray(entrada[0])
+        self.ent_indices = np.asarray(entrada[1])
+        self.graus = np.diff(self.indptr)
+        self.total_arestas = int(self.indptr[-1])
+        self.dist = np.full(self.n, -1, dtype=np.int64)
+        self.sigma = np.zeros(self.n)
+        self.delta = np.zeros(self.n)
+
+    def executar(self, fonte, com_sigma=False):
+        """
+        BFS a partir do vértice de índice ``fonte``. Retorna a lista de níveis
+        (arrays de índices; ``niveis[d]`` são os vértices à distância d). Ao final,
+        ``self.dist`` (e ``self.sigma``, com ``com_sigma``) valem para os visitados.
+        """
+        dist = self.dist
+        sigma = self.sigma
+        fronteira = np.array([fonte], dtype=np.int64)
+        dist[fonte] = 0
+        if com_sigma:
+            sigma[fonte] = 1.0
+        niveis = [fronteira]
+        arestas_nao_exploradas = self.total_arestas - int(self.graus[fonte])
+        bottom_up = False
+        nivel = 0
+
+        while True:
+            arestas_fronteira = int(self.graus[fronteira].sum())
+            if not bottom_up and arestas_fronteira > arestas_nao_exploradas / self.alfa:
+                bottom_up = True
+            elif bottom_up and len(fronteira) < self.n / self.beta:
+                bottom_up = False
+
+            if bottom_up:
+                nao_visitados = np.flatnonzero(dist < 0)
+                pos, tamanhos = _posicoes(self.ent_indptr, nao_visitados)
+                pais = self.ent_indices[pos]
+                na_fronteira = dist[pais] == nivel
+                filhos = np.repeat(nao_visitados, tamanhos)[na_fronteira]
+                pais = pais[na_fronteira]
+            else:
+                pos, tamanhos = _posicoes(self.indptr, fronteira)
+                filhos = self.indices[pos]
+                pais = np.repeat(fronteira, tamanhos)
+                livres = dist[filhos] < 0
+                filhos = filhos[livres]
+                pais = pais[livres]
+
+            if len(filhos) == 0:
+                break
+            if com_sigma:
+                nova, inverso = np.unique(filhos, return_inverse=True)
+                sigma[nova] = np.bincount(inverso, weights=sigma[pais])
+            else:
+                nova = np.unique(filhos)
+
+            nivel += 1
+            dist[nova] = nivel
+            arestas_nao_exploradas -= int(self.graus[nova].sum())
+            niveis.append(nova)
+            fronteira = nova
+
+        return niveis
+
+    def distancias(self, fonte):
+        """Níveis da BFS a partir de ``fonte`` (os buffers já são limpos ao final)."""
+        niveis = self.executar(fonte)
+        self.limpar(niveis)
+        return niveis
+
+    def dependencias(self, fonte):
+        """
+        Passo de Brandes a partir de ``fonte``: BFS com contagem de caminhos mínimos e
+        acumulação das dependências, nível a nível. Retorna os níveis; ``self.delta``
+        vale para os visitados até ``limpar``.
+        """
+        niveis = self.executar(fonte, com_sigma=True)
+        dist, sigma, delta = self.dist, self.sigma, self.delta
+        for d in range(len(niveis) - 1, 0, -1):
+            ws = niveis[d]
+            pos, tamanhos = _posicoes(self.ent_indptr, ws)
+            preds = self.ent_indices[pos]
+            donos = np.repeat(ws, tamanhos)
+            validos = dist[preds] == d - 1
+            preds = preds[validos]
+            donos = donos[validos]
+            contrib = sigma[preds] * (1.0 + delta[donos]) / sigma[donos]
+            unicos, inverso = np.unique(preds, return_inverse=True)
+            delta[unicos] += np.bincount(inverso, weights=contrib)
+        return niveis
+
+    def limpar(self, niveis):
+        """Restaura os buffers nos vértices visitados pela última busca."""
+        visitados = np.concatenate(niveis)
+        self.dist[visitados] = -1
+        self.sigma[visitados] = 0.0
+        self.delta[visitados] = 0.0
+
+
+def resumo_distancias(niveis):
+    """(número de vértices alcançados, soma das distâncias) a partir dos níveis de uma BFS."""
+    alcancados = sum(len(nivel) for nivel in niveis)
+    total = sum(d * len(nivel) for d, nivel in enumerate(niveis))
+    return alcancados, total
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+import math
+from collections import deque
+
+
+def _bfs_arvore(graph, fonte):
+    """BFS não ponderado a partir de ``fonte``; retorna (distancias, pais)."""
+    dist = {fonte: 0}
+    pai = {fonte: None}
+    queue = deque([fonte])
+    while queue:
+        u = queue.popleft()
+        for w in graph[u]:
+            if w not in dist:
+                dist[w] = dist[u] + 1
+                pai[w] = u
+                queue.append(w)
+    return dist, pai
+
+
+class IndiceMarcos:
+    """
+    Índice de marcos (ALT) para consultas ponto a ponto em grafos não-direcionados.
+
+    Guarda as distâncias BFS de alguns vértices de alto grau ("marcos") para
+    todos os outros. Pela desigualdade triangular, para qualquer par (u, v):
+    |d(l,u) - d(l,v)| <= d(u,v) <= d(l,u) + d(l,v).
+    """
+
+    def __init__(self, graph, num_marcos=16):
+        self.marcos = []
+        self.distancias = []
+        self.pais = []
+
+        # Marcos de maior grau, evitando vizinhos de marcos já escolhidos
+        # para espalhá-los pela componente.
+        vizinhos_de_marcos = set()
+        for v in sorted(graph, key=lambda x: len(graph[x]), reverse=True):
+            if len(self.marcos) >= num_marcos:
+                break
+            if v in vizinhos_de_marcos:
+                continue
+            dist, pai = _bfs_arvore(graph, v)
+            self.marcos.append(v)
+            self.distancias.append(dist)
+            self.pais.append(pai)
+            vizinhos_de_marcos.add(v)
+            vizinhos_de_marcos.update(graph[v])
+
+    def limites(self, u, v):
+        """Retorna (limite_inferior, limite_superior) para a distância entre u e v."""
+        if u == v:
+            return 0, 0
+        inferior = 0
+        superior = math.inf
+        for dist in self.distancias:
+            du = dist.get(u)
+            dv = dist.get(v)
+            if du is None and dv is None:
+                continue
+            if du is None or dv is None:
+                # O marco alcança apenas um dos dois: estão em componentes diferentes
+                return math.inf, math.inf
+            inferior = max(inferior, abs(du - dv))
+            superior = min(superior, du + dv)
+        return inferior, superior
+
+    def caminho(self, u, v, graph=None):
+        """Caminho mínimo u -> v passando por um marco, se o índice o garantir; senão None."""
+        inferior, superior = self.limites(u, v)
+        if u == v:
+            return [u]
+        if superior == math.inf or inferior != superior:
+            return None
+        return self._caminho_pelo_marco(u, v, superior)
+
+    def _caminho_pelo_marco(self, u, v, comprimento):
+        for dist, pai in zip(self.distancias, self.pais):
+            du = dist.get(u)
+            dv = dist.get(v)
+            if du is None or dv is None or du + dv != comprimento:
+                continue
+            ida = []
+            x = u
+            while x is not None:
+                ida.append(x)
+                x = pai[x]
+            volta = []
+            x = v
+            while x is not None:
+                volta.append(x)
+                x = pai[x]
+            # As duas cadeias terminam no marco; a segunda é invertida sem repeti-lo
+            return ida + volta[::-1][1:]
+        return None
+
+
+def _busca_bidirecional(graph, u, v, indice=None):
+    """
+    BFS bidirecional que expande sempre a menor fronteira.
+    Retorna (distancia, caminho) ou (math.inf, None).
+    """
+    if u == v:
+        return 0, [u]
+
+    superior = math.inf
+    marcos_u = marcos_v = None
+    if indice is not None:
+        inferior, superior = indice.limites(u, v)
+        if inferior == math.inf:
+            return math.inf, None
+        if inferior == superior:
+            return superior, indice.caminho(u, v, graph)
+        # distâncias dos marcos até os alvos, para podar a busca
+        marcos_v = [dist.get(v) for dist in indice.distancias]
+        marcos_u = [dist.get(u) for dist in indice.distancias]
+
+    def limite_inferior(w, marcos_alvo):
+        melhor = 0
+        for dist, dt in zip(indice.distancias, marcos_alvo):
+            dw = dist.get(w)
+            if dw is not None and dt is not None:
+                melhor = max(melhor, abs(dw - dt))
+        return melhor
+
+    dist_f, pai_f = {u: 0}, {u: None}
+    dist_t, pai_t = {v: 0}, {v: None}
+    fronteira_f, fronteira_t = [u], [v]
+    nivel_f = nivel_t = 0
+    melhor = math.inf
+    encontro = None
+
+    while fronteira_f and fronteira_t:
+        # Nenhum caminho ainda não visto pode ser menor que o limite superior do índice
+        if nivel_f + nivel_t + 1 >= superior:
+            break
+
+        if len(fronteira_f) <= len(fronteira_t):
+            dist_a, pai_a, dist_b, fronteira, alvo = dist_f, pai_f, dist_t, fronteira_f, marcos_v
+            nivel_f += 1
+            nivel = nivel_f
+        else:
+            dist_a, pai_a, dist_b, fronteira, alvo = dist_t, pai_t, dist_f, fronteira_t, marcos_u
+            nivel_t += 1
+            nivel = nivel_t
+
+        proxima = []
+        for x in fronteira:
+            for w in graph[x]:
+                if w in dist_b:
+                    candidato = nivel + dist_b[w]
+                    if candidato < melhor:
+                        melhor = candidato
+                        encontro = (x, w) if dist_a is dist_f else (w, x)
+                    continue
+                if w in dist_a:
+                    continue
+                if indice is not None and nivel + limite_inferior(w, alvo) >= superior:
+                    continue
+                dist_a[w] = nivel
+                pai_a[w] = x
+                proxima.append(w)
+
+        if dist_a is dist_f:
+            fronteira_f = proxima
+        else:
+            fronteira_t = proxima
+
+        # Ao fim de um nível completo, o menor encontro é a distância exata
+        if melhor < math.inf:
+            break
+
+    if melhor < math.inf and melhor <= superior:
+        x, w = encontro
+        caminho = []
+        while x is not None:
+            caminho.append(x)
+            x = pai_f[x]
+        caminho.reverse()
+        while w is not None:
+            caminho.append(w)
+            w = pai_t[w]
+        return melhor, caminho
+
+    if superior < math.inf:
+        return superior, indice._caminho_pelo_marco(u, v, superior)
+    return math.inf, None
+
+
+def distancia(graph, u, v, indice=None):
+    """
+    Distância (número de arestas) entre u e v em um grafo não-direcionado.
+    Retorna ``math.inf`` se não houver caminho. ``indice`` (opcional) é um
+    ``IndiceMarcos``, usado para limitar e podar a busca, ou um ``RotulosPLL``,
+    que responde a distância exata diretamente.
+    """
+    if u not in graph:
+        raise ValueError(f"Vértice {u} não existe no grafo.")
+    if v not in graph:
+        raise ValueError(f"Vértice {v} não existe no grafo.")
+    return _busca_bidirecional(graph, u, v, indice)[0]
+
+
+def caminho_mais_curto(graph, u, v, indice=None):
+    """Lista de vértices de um caminho mínimo de u até v, ou None se não houver caminho."""
+    if u not in graph:
+        raise ValueError(f"Vértice {u} não existe no grafo.")
+    if v not in graph:
+        raise ValueError(f"Vértice {v} não existe no grafo.")
+    return _busca_bidirecional(graph, u, v, indice)[1]
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from .csr import como_csr
+
+
+def _pesos_por_comunidade(origens, rotulos_destino, pesos, n):
+    """Soma os pesos de cada par (vértice, comunidade vizinha). Retorna (vertice, comunidade, soma)."""
+    chave = origens.astype(np.int64) * n + rotulos_destino
+    unicas, inverso = np.unique(chave, return_inverse=True)
+    soma = np.bincount(inverso, weights=pesos)
+    return unicas // n, unicas % n, soma
+
+
+def _melhor_por_vertice(vertice, chaves_de_ordenacao):
+    """Posição, em cada grupo de ``vertice``, da primeira linha segundo ``chaves_de_ordenacao``."""
+    ordem = np.lexsort(tuple(chaves_de_ordenacao) + (vertice,))
+    ordenado = vertice[ordem]
+    primeiro = np.ones(len(ordem), dtype=bool)
+    primeiro[1:] = ordenado[1:] != ordenado[:-1]
+    return ordem[primeiro]
+
+
+def _modularidade_arrays(origens, indices, pesos, rotulos):
+    m2 = pesos.sum()
+    if m2 == 0:
+        return 0.0
+    n = len(rotulos)
+    k = np.bincount(origens, weights=pesos, minlength=n)
+    interno = pesos[rotulos[origens] == rotulos[indices]].sum()
+    total = np.bincount(rotulos, weights=k)
+    return float(interno / m2 - np.dot(total, total) / (m2 * m2))
+
+
+def modularidade(graph, comunidades):
+    """Modularidade de Newman da partição ``comunidades`` ({vértice: id}) de um grafo não-direcionado."""
+    csr = como_csr(graph)
+    rotulos = np.fromiter((comunidades[v] for v in csr.vertices), dtype=np.int64, count=len(csr))
+    _, rotulos = np.unique(rotulos, return_inverse=True)
+    return _modularidade_arrays(csr.origens(), csr.indices, csr.pesos, rotulos)
+
+
+def propagacao_de_rotulos(graph, max_iter=100, ponderado=True, seed=42):
+    """
+    Detecção de comunidades por propagação de rótulos (semi-síncrona).
+
+    Cada vértice adota o rótulo de maior peso somado entre seus vizinhos; empates
+    favorecem o rótulo atual e, depois, são decididos aleatoriamente.
+    Retorna ({vértice: id_comunidade}, modularidade).
+    """
+    csr = como_csr(graph)
+    n = len(csr)
+    if n == 0:
+        return {}, 0.0
+
+    rng = np.random.default_rng(seed)
+    origens = csr.origens()
+    indices = csr.indices
+    pesos = csr.pesos if ponderado else np.ones(len(indices))
+    rotulos = np.arange(n, dtype=np.int64)
+
+    for _ in range(max_iter):
+        vert, rot, soma = _pesos_por_comunidade(origens, rotulos[indices], pesos, n)
+        if len(vert) == 0:
+            break
+        atual = (rot == rotulos[vert]).astype(np.int8)
+        ruido = rng.random(len(vert))
+        melhores = _melhor_por_vertice(vert, (ruido, -atual, -soma))
+        querem_mudar = melhores[rot[melhores] != rotulos[vert[melhores]]]
+        if len(querem_mudar) == 0:
+            break
+        movem = querem_mudar[rng.random(len(querem_mudar)) < 0.5]
+        rotulos[vert[movem]] = rot[movem]
+
+    _, rotulos = np.unique(rotulos, return_inverse=True)
+    mod = _modularidade_arrays(origens, indices, csr.pesos, rotulos)
+    return {v: int(c) for v, c in zip(csr.vertices, rotulos.tolist())}, mod
+
+
+def _movimentos_locais(origens, indices, pesos, n, rng, max_varreduras, tolerancia):
+    """Fase de movimentos locais do Louvain, vetorizada. Retorna os rótulos por vértice."""
+    m2 = pesos.sum()
+    k = np.bincount(origens, weights=pesos, minlength=n)
+    rotulos = np.arange(n, dtype=np.int64)
+    total = k.copy()
+    q = _modularidade_arrays(origens, indices, pesos, rotulos)
+
+    sem_laco = origens != indices
+    origens_nl = origens[sem_laco]
+    indices_nl = indices[sem_laco]
+    pesos_nl = pesos[sem_laco]
+
+    # Todos os vértices avaliam suas comunidades vizinhas ao mesmo tempo, mas só uma
+    # fração aleatória se move em cada varredura, para que vizinhos não troquem de
+    # comunidade entre si indefinidamente.
+    fracao = 0.5
+    for _ in range(max_varreduras):
+        vert, com, kic = _pesos_por_comunidade(origens_nl, rotulos[indices_nl], pesos_nl, n)
+        if len(vert) == 0:
+            break
+        propria = com == rotulos[vert]
+
+        # Ganho (a menos de um fator 1/m) de colocar o vértice em cada comunidade vizinha,
+        # considerando a própria comunidade sem ele.
+        total_sem_v = total[com] - np.where(propria, k[vert], 0.0)
+        ganho = kic - k[vert] * total_sem_v / m2
+
+        ficar = -k * (total[rotulos] - k) / m2
+        ficar[vert[propria]] += kic[propria]
+
+        melhores = _melhor_por_vertice(vert, (-ganho,))
+        v_melhor = vert[melhores]
+        candidatos = (com[melhores] != rotulos[v_melhor]) & (ganho[melhores] > ficar[v_melhor] + 1e-12)
+        if not candidatos.any():
+            break
+
+        escolhidos = melhores[candidatos]
+        escolhidos = escolhidos[rng.random(len(escolhidos)) < fracao]
+        novos = rotulos.copy()
+        novos[vert[escolhidos]] = com[escolhidos]
+        q_novo = _modularidade_arrays(origens, indices, pesos, novos)
+
+        if q_novo > q + tolerancia:
+            rotulos = novos
+            total = np.bincount(rotulos, weights=k, minlength=n)
+            q = q_novo
+        else:
+            # Movimentos simultâneos demais se anularam: tenta um subconjunto menor
+            fracao /= 2
+            if fracao < 1e-3:
+                break
+
+    return rotulos
+
+
+def _agregar(origens, indices, pesos, rotulos, nc):
+    """Colapsa cada comunidade em um super-vértice; arestas internas viram laços."""
+    chave = rotulos[origens] * nc + rotulos[indices]
+    unicas, inverso = np.unique(chave, return_inverse=True)
+    novos_pesos = np.bincount(inverso, weights=pesos)
+    novas_origens = unicas // nc
+    novos_indices = unicas % nc
+    return novas_origens, novos_indices, novos_pesos
+
+
+def louvain(graph, max_niveis=20, max_varreduras=50, tolerancia=1e-7, seed=42):
+    """
+    Otimização de modularidade pelo método de Louvain sobre um grafo não-direcionado ponderado.
+
+    Alterna movimentos locais vetorizados e agregação das comunidades em super-vértices
+    até que nenhum nível melhore a partição.
+    Retorna ({vértice: id_comunidade}, modularidade).
+    """
+    csr = como_csr(graph)
+    n0 = len(csr)
+    if n0 == 0:
+        return {}, 0.0
+
+    rng = np.random.default_rng(seed)
+    origens = csr.origens().astype(np.int64)
+    indices = csr.indices.astype(np.int64)
+    pesos = csr.pesos
+    n = n0
+    comunidade = np.arange(n0, dtype=np.int64)
+
+    for _ in range(max_niveis):
+        rotulos = _movimentos_locais(origens, indices, pesos, n, rng, max_varreduras, tolerancia)
+        _, rotulos = np.unique(rotulos, return_inverse=True)
+        nc = int(rotulos.max()) + 1
+        comunidade = rotulos[comunidade]
+        if nc == n:
+            break
+        origens, indices, pesos = _agregar(origens, indices, pesos, rotulos, nc)
+        n = nc
+
+    mod = _modularidade_arrays(csr.origens(), csr.indices, csr.pesos, comunidade)
+    return {v: int(c) for v, c in zip(csr.vertices, comunidade.tolist())}, mod
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+from .bfs import BuscaEmLargura
+from .csr import GrafoCSR, como_csr
+
+
+def _executar_lote(csr, indices, funcao):
+    # Cada lote tem seu próprio kernel de BFS: os buffers não são compartilhados entre threads
+    busca = BuscaEmLargura(csr)
+    return [funcao(busca, i) for i in indices]
+
+
+def consultar_em_paralelo(graph, vertices, funcao, max_workers=None):
+    """
+    Executa ``funcao(busca, i)`` para cada vértice de ``vertices`` num pool de threads
+    e retorna {vértice: resultado}. ``i`` é o índice do vértice no CSR e ``busca`` um
+    ``BuscaEmLargura`` exclusivo da thread; ``funcao`` deve deixar os buffers limpos
+    (ex.: usando ``busca.distancias``).
+
+    As consultas usam um snapshot congelado do grafo (uma cópia, se ``graph`` for um
+    ``GrafoCSR`` ainda não congelado), então nenhuma thread pode alterá-lo. O
+    trabalho pesado de cada BFS fica nos kernels do NumPy, que liberam o GIL em
+    arrays grandes; em builds do CPython sem GIL, as threads rodam em paralelo
+    também no código Python.
+    """
+    if isinstance(graph, GrafoCSR):
+        csr = graph.copia_congelada()
+    else:
+        # CSR novo, construído só para esta chamada: pode ser congelado no lugar
+        csr = como_csr(graph).congelar()
+    vertices = list(vertices)
+    if not vertices:
+        return {}
+    workers = max_workers or os.cpu_count() or 1
+    indices = [csr.indice[v] for v in vertices]
+    # Mais lotes que threads, para equilibrar a carga
+    num_lotes = min(len(indices), 4 * workers)
+    tamanho = -(-len(indices) // num_lotes)
+    lotes = [indices[a:a + tamanho] for a in range(0, len(indices), tamanho)]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        resultados = executor.map(lambda lote: _executar_lote(csr, lote, funcao), lotes)
+        return dict(zip(vertices, chain.from_iterable(resultados)))
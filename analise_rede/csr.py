@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import numpy as np
+
+
+class _VizinhosCSR(Mapping):
+    """Visão somente leitura dos vizinhos de um vértice ({vizinho: peso})."""
+
+    __slots__ = ("_grafo", "_inicio", "_fim")
+
+    def __init__(self, grafo, i):
+        self._grafo = grafo
+        self._inicio = int(grafo.indptr[i])
+        self._fim = int(grafo.indptr[i + 1])
+
+    def __getitem__(self, w):
+        j = self._grafo.indice.get(w)
+        if j is None:
+            raise KeyError(w)
+        linha = self._grafo.indices[self._inicio:self._fim]
+        pos = int(np.searchsorted(linha, j))
+        if pos >= len(linha) or linha[pos] != j:
+            raise KeyError(w)
+        return self._grafo.pesos[self._inicio + pos].item()
+
+    def __iter__(self):
+        vertices = self._grafo.vertices
+        for j in self._grafo.indices[self._inicio:self._fim].tolist():
+            yield vertices[j]
+
+    def __len__(self):
+        return self._fim - self._inicio
+
+    def items(self):
+        vertices = self._grafo.vertices
+        indices = self._grafo.indices[self._inicio:self._fim].tolist()
+        pesos = self._grafo.pesos[self._inicio:self._fim].tolist()
+        return [(vertices[j], p) for j, p in zip(indices, pesos)]
+
+    def values(self):
+        return self._grafo.pesos[self._inicio:self._fim].tolist()
+
+
+class GrafoCSR(Mapping):
+    """
+    Grafo em formato CSR (Compressed Sparse Row) com vértices indexados por inteiros.
+
+    ``indptr[i]:indptr[i+1]`` delimita, em ``indices`` e ``pesos``, os vizinhos do
+    vértice ``vertices[i]``, ordenados por índice. A classe também se comporta como
+    o dicionário de adjacência somente leitura ({vértice: {vizinho: peso}}), então
+    pode ser passada às funções de ``algoritmos`` no lugar de ``lista_adj``.
+    """
+
+    def __init__(self, vertices, indptr, indices, pesos, entrada=None):
+        self.vertices = list(vertices)
+        self.indice = {v: i for i, v in enumerate(self.vertices)}
+        self.indptr = indptr
+        self.indices = indices
+        self.pesos = pesos
+        # (indptr, indices) da transposta, quando já conhecida (ver ``entrada``)
+        self._entrada = entrada
+        self.congelado = False
+
+    @classmethod
+    def de_lista_adj(cls, graph):
+        """Constrói a representação CSR a partir de um dicionário de adjacência."""
+        vertices = list(graph)
+        indice = {v: i for i, v in enumerate(vertices)}
+        # vértices que só aparecem como vizinhos (sem entrada própria no dicionário)
+        for nbrs in list(graph.values()):
+            for w in nbrs:
+                if w not in indice:
+                    indice[w] = len(vertices)
+                    vertices.append(w)
+
+        n = len(vertices)
+        graus = np.fromiter((len(graph.get(v, {})) for v in vertices), dtype=np.int64, count=n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(graus, out=indptr[1:])
+        m = int(indptr[-1])
+
+        indices = np.fromiter(
+            (indice[w] for v in vertices for w in graph.get(v, {})), dtype=np.int32, count=m
+        )
+        pesos = np.fromiter(
+            (p for v in vertices for p in graph.get(v, {}).values()), dtype=np.float64, count=m
+        )
+
+        # Ordena os vizinhos de cada linha por índice
+        linhas = np.repeat(np.arange(n, dtype=np.int32), graus)
+        ordem = np.lexsort((indices, linhas))
+        return cls(vertices, indptr, indices[ordem], pesos[ordem])
+
+    def numero_vertices(self):
+        return len(self.vertices)
+
+    def numero_entradas(self):
+        """Número de entradas na estrutura (cada aresta não-direcionada conta duas vezes)."""
+        return int(self.indptr[-1])
+
+    def graus(self):
+        return np.diff(self.indptr)
+
+    def origens(self):
+        """Array com o vértice de origem de cada entrada (forma COO de ``indices``)."""
+        return np.repeat(np.arange(len(self.vertices), dtype=np.int32), self.graus())
+
+    def entrada(self):
+        """
+        (indptr, indices) da transposta: os vizinhos de *entrada* de cada vértice.
+        Em grafos simétricos (não-direcionados) são os próprios arrays do grafo.
+        """
+        if self._entrada is None:
+            n = len(self.vertices)
+            origens = self.origens()
+            ordem = np.lexsort((origens, self.indices))
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=n), out=indptr[1:])
+            indices = origens[ordem].astype(self.indices.dtype)
+            if np.array_equal(indptr, self.indptr) and np.array_equal(indices, self.indices):
+                self._entrada = (self.indptr, self.indices)
+            else:
+                self._entrada = (indptr, indices)
+        return self._entrada
+
+    def congelar(self):
+        """
+        Torna o grafo imutável, para consultas simultâneas de várias threads: arrays
+        somente leitura, vértices e índice somente leitura e a transposta já calculada
+        (o único cache preenchido sob demanda). Retorna o próprio grafo.
+        """
+        if not self.congelado:
+            self.entrada()
+            for array in (self.indptr, self.indices, self.pesos) + tuple(self._entrada):
+                array.setflags(write=False)
+            self.vertices = tuple(self.vertices)
+            self.indice = MappingProxyType(self.indice)
+            self.congelado = True
+        return self
+
+    def copia_congelada(self):
+        """Snapshot congelado com cópias dos arrays; este grafo não é alterado."""
+        if self.congelado:
+            return self
+        return GrafoCSR(self.vertices, self.indptr.copy(), self.indices.copy(), self.pesos.copy()).congelar()
+
+    def __getstate__(self):
+        # MappingProxyType não é serializável: o índice vai como dicionário comum
+        estado = self.__dict__.copy()
+        estado["indice"] = dict(self.indice)
+        return estado
+
+    def __setstate__(self, estado):
+        # Arrays desserializados voltam graváveis; um snapshot congelado é congelado de novo
+        congelado = estado.get("congelado", False)
+        self.__dict__.update(estado)
+        self.congelado = False
+        if congelado:
+            self.congelar()
+
+    def eh_simetrico(self):
+        """True se toda aresta u -> v tem a aresta v -> u correspondente."""
+        return self.entrada()[1] is self.indices
+
+    def vizinhos(self, i):
+        """Índices dos vizinhos do vértice de índice ``i``."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def __getitem__(self, v):
+        i = self.indice.get(v)
+        if i is None:
+            raise KeyError(v)
+        return _VizinhosCSR(self, i)
+
+    def __contains__(self, v):
+        return v in self.indice
+
+    def __iter__(self):
+        return iter(self.vertices)
+
+    def __len__(self):
+        return len(self.vertices)
+
+
+def como_csr(graph):
+    """Retorna ``graph`` se já for ``GrafoCSR``; caso contrário, converte."""
+    if isinstance(graph, GrafoCSR):
+        return graph
+    return GrafoCSR.de_lista_adj(graph)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from .bfs import BuscaEmLargura
+from .csr import como_csr
+
+
+def _preparar(graph, vertice):
+    """
+    Kernel de BFS e índices da componente analisada: a de ``vertice`` ou, sem ele,
+    a maior componente conexa. Só aceita grafos não-direcionados.
+    """
+    csr = como_csr(graph)
+    if not csr.eh_simetrico():
+        raise ValueError("Diâmetro e excentricidades exigem um grafo não-direcionado.")
+    busca = BuscaEmLargura(csr)
+
+    if vertice is not None:
+        if vertice not in csr.indice:
+            raise ValueError(f"Vértice {vertice} não existe no grafo.")
+        niveis = busca.executar(csr.indice[vertice])
+        componente = np.concatenate(niveis)
+        busca.limpar(niveis)
+        return csr, busca, componente
+
+    # Maior componente: os buffers não são limpos entre componentes, como em count_connected_components
+    componente = np.empty(0, dtype=np.int64)
+    for i in range(len(csr)):
+        if busca.dist[i] >= 0:
+            continue
+        atual = np.concatenate(busca.executar(i))
+        if len(atual) > len(componente):
+            componente = atual
+    busca.dist[:] = -1
+    return csr, busca, componente
+
+
+def _excentricidade(busca, fonte):
+    """BFS a partir de ``fonte``: retorna (excentricidade, níveis); o chamador limpa os buffers."""
+    niveis = busca.executar(fonte)
+    return len(niveis) - 1, niveis
+
+
+def diametro(graph, vertice=None, tolerancia=0, max_buscas=None):
+    """
+    Diâmetro da componente (a maior, ou a de ``vertice``) pelo algoritmo iFUB.
+
+    Um double sweep a partir do vértice de maior grau dá o limite inferior e o ponto
+    médio do caminho encontrado serve de raiz; os vértices são então examinados do
+    nível mais distante da raiz para o mais próximo, e cada nível i examinado baixa o
+    limite superior para 2(i - 1). Em grafos de mundo pequeno isso costuma exigir
+    poucas BFS. A busca termina quando ``limite_superior - limite_inferior <=
+    tolerancia`` ou após ``max_buscas`` BFS.
+
+    Retorna {'diametro', 'limite_inferior', 'limite_superior', 'exato', 'buscas'};
+    'diametro' é o limite inferior (o valor exato quando 'exato' é True).
+    """
+    csr, busca, componente = _preparar(graph, vertice)
+    if len(componente) <= 1:
+        return {'diametro': 0, 'limite_inferior': 0, 'limite_superior': 0, 'exato': True, 'buscas': 0}
+
+    buscas = 0
+
+    def resultado(inf, sup):
+        return {'diametro': inf, 'limite_inferior': inf, 'limite_superior': sup,
+                'exato': inf == sup, 'buscas': buscas}
+
+    # Double sweep: maior grau -> vértice mais distante a -> vértice mais distante b
+    graus = csr.graus()
+    r = int(componente[np.argmax(graus[componente])])
+    _, niveis = _excentricidade(busca, r)
+    a = int(niveis[-1][0])
+    busca.limpar(niveis)
+    ecc_a, niveis = _excentricidade(busca, a)
+    buscas += 2
+    dist_a = busca.dist.copy()
+    b = int(niveis[-1][0])
+    busca.limpar(niveis)
+
+    # Ponto médio do caminho mínimo a-b, andando de b em direção a a
+    u = b
+    while dist_a[u] > ecc_a // 2:
+        vizinhos = csr.vizinhos(u)
+        u = int(vizinhos[dist_a[vizinhos] == dist_a[u] - 1][0])
+
+    ecc_u, niveis_u = _excentricidade(busca, u)
+    busca.limpar(niveis_u)
+    buscas += 1
+    inf = max(ecc_a, ecc_u)
+    sup = 2 * ecc_u
+
+    i = ecc_u
+    while sup - inf > tolerancia and i > 0:
+        maior_no_nivel = 0
+        for v in niveis_u[i].tolist():
+            if max_buscas is not None and buscas >= max_buscas:
+                return resultado(max(inf, maior_no_nivel), sup)
+            ecc_v, niveis = _excentricidade(busca, v)
+            busca.limpar(niveis)
+            buscas += 1
+            maior_no_nivel = max(maior_no_nivel, ecc_v)
+        inf = max(inf, maior_no_nivel)
+        # Vértices mais próximos da raiz que o nível i - 1 não têm excentricidade acima de 2(i - 1)
+        if inf > 2 * (i - 1):
+            sup = inf
+        else:
+            sup = 2 * (i - 1)
+        i -= 1
+    return resultado(inf, max(sup, inf))
+
+
+def excentricidades(graph, vertice=None, apenas_extremos=False, max_buscas=None):
+    """
+    Limites de excentricidade de todos os vértices da componente (a maior, ou a de
+    ``vertice``), com diâmetro e raio, pelo algoritmo de limites de Takes e Kosters.
+
+    Cada BFS a partir de v (escolhido alternadamente entre o candidato de maior limite
+    superior e o de menor limite inferior) refina, para todo w, inf(w) >= max(e(v) -
+    d(v, w), d(v, w)) e sup(w) <= e(v) + d(v, w). Saem dos candidatos os vértices com
+    excentricidade já exata; com ``apenas_extremos``, também os que não podem mais
+    alterar diâmetro nem raio, e a busca para assim que ambos convergem.
+
+    Retorna {'excentricidade': {v: (inf, sup)}, 'diametro': (inf, sup),
+    'raio': (inf, sup), 'buscas'}.
+    """
+    csr, busca, componente = _preparar(graph, vertice)
+    m = len(componente)
+    graus = csr.graus()[componente]
+    inf = np.zeros(m, dtype=np.int64)
+    sup = np.full(m, np.iinfo(np.int64).max // 4, dtype=np.int64)
+    candidato = np.ones(m, dtype=bool)
+    if m <= 1:
+        candidato[:] = False
+        sup[:] = 0
+
+    buscas = 0
+    pelo_maior_sup = True
+    while candidato.any():
+        if max_buscas is not None and buscas >= max_buscas:
+            break
+        cand = np.flatnonzero(candidato)
+        # Desempate pelo maior grau
+        if pelo_maior_sup:
+            j = cand[np.lexsort((-graus[cand], -sup[cand]))[0]]
+        else:
+            j = cand[np.lexsort((-graus[cand], inf[cand]))[0]]
+        pelo_maior_sup = not pelo_maior_sup
+
+        e, niveis = _excentricidade(busca, componente[j])
+        d = busca.dist[componente]
+        busca.limpar(niveis)
+        buscas += 1
+
+        np.maximum(inf, np.maximum(e - d, d), out=inf)
+        np.minimum(sup, e + d, out=sup)
+        inf[j] = sup[j] = e
+
+        candidato &= inf != sup
+        if apenas_extremos:
+            diametro_inf, raio_sup = inf.max(), sup.min()
+            candidato &= ~((sup <= diametro_inf) & (inf >= raio_sup))
+            if diametro_inf == sup.max() and raio_sup == inf.min():
+                break
+
+    vertices = csr.vertices
+    return {
+        'excentricidade': {vertices[i]: (a, b) for i, a, b in zip(componente.tolist(), inf.tolist(), sup.tolist())},
+        'diametro': (int(inf.max()), int(sup.max())),
+        'raio': (int(inf.min()), int(sup.min())),
+        'buscas': buscas,
+    }
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+import math
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .processador_dados import limpar_string
+
+
+def _hashes(chaves, seed):
+    """Dois hashes uint64 independentes por chave (hash do Python misturado com splitmix64)."""
+    x = np.array([hash(c) for c in chaves], dtype=np.int64).view(np.uint64)
+    x = x + np.uint64((seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x = x ^ (x >> np.uint64(31))
+    # O segundo hash é ímpar, para percorrer todas as posições no hashing duplo
+    return x & np.uint64(0xFFFFFFFF), (x >> np.uint64(32)) | np.uint64(1)
+
+
+class EsbocoCountMin:
+    """
+    Esboço Count-Min: ``profundidade`` linhas de ``largura`` contadores. Cada chave soma
+    sua contagem em uma posição por linha, e a estimativa é o mínimo entre as linhas.
+    A estimativa nunca fica abaixo do valor real e, com probabilidade 1 - delta, não o
+    excede em mais de epsilon * total.
+    """
+
+    def __init__(self, epsilon=1e-4, delta=1e-3, seed=42):
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon e delta devem estar entre 0 e 1.")
+        self.epsilon = epsilon
+        self.largura = math.ceil(math.e / epsilon)
+        self.profundidade = math.ceil(math.log(1 / delta))
+        self.seed = seed
+        self.tabela = np.zeros((self.profundidade, self.largura), dtype=np.int64)
+        self.total = 0
+
+    def _posicoes(self, chaves):
+        h1, h2 = _hashes(chaves, self.seed)
+        largura = np.uint64(self.largura)
+        return [((h1 + np.uint64(i) * h2) % largura).astype(np.int64) for i in range(self.profundidade)]
+
+    def adicionar(self, contagens):
+        """Soma um lote {chave: contagem}."""
+        if not contagens:
+            return
+        valores = np.fromiter(contagens.values(), dtype=np.int64, count=len(contagens))
+        for linha, posicoes in zip(self.tabela, self._posicoes(list(contagens))):
+            np.add.at(linha, posicoes, valores)
+        self.total += int(valores.sum())
+
+    def estimar(self, chaves):
+        """Estimativas (limites superiores) das contagens das ``chaves``."""
+        if not chaves:
+            return np.empty(0, dtype=np.int64)
+        linhas = [linha[posicoes] for linha, posicoes in zip(self.tabela, self._posicoes(chaves))]
+        return np.minimum.reduce(linhas)
+
+    def erro_maximo(self):
+        return self.epsilon * self.total
+
+
+class EsbocoSpaceSaving:
+    """
+    Resumo Space-Saving (equivalente ao Misra-Gries) com no máximo ``capacidade`` chaves.
+
+    Os lotes são somados ao resumo e, se ele passa da capacidade, o (capacidade + 1)-ésimo
+    maior valor é subtraído de todas as chaves e as que chegam a zero saem. Para cada chave
+    mantida, o valor real fica entre o contador e o contador + ``descontado``, e
+    ``descontado`` nunca passa de total / (capacidade + 1). Toda chave com valor real
+    acima desse limite está no resumo.
+    """
+
+    def __init__(self, capacidade=1000):
+        if capacidade < 1:
+            raise ValueError("A capacidade deve ser positiva.")
+        self.capacidade = capacidade
+        self.contadores = {}
+        self.descontado = 0
+        self.total = 0
+
+    def adicionar(self, contagens):
+        """Soma um lote {chave: contagem}."""
+        contadores = self.contadores
+        for chave, valor in contagens.items():
+            contadores[chave] = contadores.get(chave, 0) + valor
+            self.total += valor
+        if len(contadores) > self.capacidade:
+            valores = np.fromiter(contadores.values(), dtype=np.int64, count=len(contadores))
+            k = len(valores) - self.capacidade - 1
+            limiar = int(np.partition(valores, k)[k])
+            self.contadores = {c: v - limiar for c, v in contadores.items() if v > limiar}
+            self.descontado += limiar
+
+    def mais_frequentes(self, n):
+        """Os ``n`` maiores como lista de (chave, limite_inferior, limite_superior)."""
+        pares = sorted(self.contadores.items(), key=lambda par: (-par[1], str(par[0])))[:n]
+        return [(chave, valor, valor + self.descontado) for chave, valor in pares]
+
+
+class FiltroBloom:
+    """Filtro de Bloom com ``bits`` posições e ``num_hashes`` funções de hash."""
+
+    def __init__(self, bits=1 << 27, num_hashes=4, seed=42):
+        self.bits = bits
+        self.num_hashes = num_hashes
+        self.seed = seed
+        self.mapa = np.zeros((bits + 7) // 8, dtype=np.uint8)
+
+    def inserir_novos(self, chaves):
+        """
+        Insere as ``chaves`` (distintas entre si) e devolve a máscara das que ainda não
+        estavam no filtro. Um falso positivo faz uma chave nova parecer repetida.
+        """
+        if not chaves:
+            return np.zeros(0, dtype=bool)
+        h1, h2 = _hashes(chaves, self.seed)
+        presentes = np.ones(len(chaves), dtype=bool)
+        posicoes = []
+        for i in range(self.num_hashes):
+            p = ((h1 + np.uint64(i) * h2) % np.uint64(self.bits)).astype(np.int64)
+            presentes &= ((self.mapa[p >> 3] >> (p & 7).astype(np.uint8)) & 1).astype(bool)
+            posicoes.append(p)
+        p = np.concatenate(posicoes)
+        np.bitwise_or.at(self.mapa, p >> 3, (1 << (p & 7)).astype(np.uint8))
+        return ~presentes
+
+    def taxa_falsos_positivos(self):
+        """Probabilidade atual de uma chave nova ser dada como presente."""
+        ocupacao = np.unpackbits(self.mapa).sum() / (8 * len(self.mapa))
+        return float(ocupacao ** self.num_hashes)
+
+
+class TopNEmFluxo:
+    """
+    Rankings aproximados em uma única passada pelo catálogo, sem construir ``Grafo``:
+
+    - 'diretores_obras': obras de cada diretor;
+    - 'diretores_grau': atores distintos de cada diretor (grau de entrada no grafo direcionado);
+    - 'atores_grau': colegas de elenco distintos (grau no grafo de atores);
+    - 'atores_forca': soma dos pesos das arestas no grafo de atores;
+    - 'pares': peso da aresta entre dois atores (obras em comum).
+
+    Cada ranking tem um resumo Space-Saving e um Count-Min, que juntos limitam o valor
+    real por baixo e por cima; a memória não depende do tamanho do catálogo. Nos graus,
+    um par já visto é reconhecido por um filtro de Bloom, cujos falsos positivos podem
+    deixar de contar algumas arestas novas (taxa em ``taxa_falsos_positivos``).
+    """
+
+    RANKINGS = ('diretores_obras', 'diretores_grau', 'atores_grau', 'atores_forca', 'pares')
+
+    def __init__(self, capacidade=2000, epsilon=1e-4, delta=1e-3, bits_filtro=1 << 27, seed=42):
+        self.resumos = {nome: EsbocoSpaceSaving(capacidade) for nome in self.RANKINGS}
+        self.esbocos = {nome: EsbocoCountMin(epsilon, delta, seed + i) for i, nome in enumerate(self.RANKINGS)}
+        self.filtro = FiltroBloom(bits_filtro, seed=seed)
+        self.obras = 0
+
+    def adicionar_obras(self, obras):
+        """Processa um lote de obras, cada uma como (diretores, elenco) já normalizados."""
+        lotes = {nome: Counter() for nome in self.RANKINGS}
+        autoria = Counter()
+        for diretores, elenco in obras:
+            diretores = list(dict.fromkeys(diretores))
+            lotes['diretores_obras'].update(diretores)
+            autoria.update((a, d) for a in elenco for d in diretores)
+            lotes['pares'].update(
+                (a, b) if a < b else (b, a)
+                for i, a in enumerate(elenco) for b in elenco[i + 1:] if a != b
+            )
+            self.obras += 1
+
+        for (a, b), peso in lotes['pares'].items():
+            lotes['atores_forca'][a] += peso
+            lotes['atores_forca'][b] += peso
+
+        # Pares vistos pela primeira vez são arestas novas: somam 1 ao grau dos extremos.
+        # As arestas ator -> diretor levam um prefixo para não colidirem com pares de atores.
+        chaves = [('dir',) + par for par in autoria] + list(lotes['pares'])
+        novos = self.filtro.inserir_novos(chaves).tolist()
+        for chave, novo in zip(chaves, novos):
+            if not novo:
+                continue
+            if len(chave) == 3:
+                lotes['diretores_grau'][chave[2]] += 1
+            else:
+                lotes['atores_grau'][chave[0]] += 1
+                lotes['atores_grau'][chave[1]] += 1
+
+        for nome, lote in lotes.items():
+            self.resumos[nome].adicionar(lote)
+            self.esbocos[nome].adicionar(lote)
+
+    def top_n(self, nome, n=10):
+        """
+        Os ``n`` maiores do ranking ``nome`` como lista de
+        (chave, estimativa, limite_inferior, limite_superior); a estimativa é o limite superior.
+        """
+        if nome not in self.resumos:
+            raise ValueError(f"Ranking desconhecido: {nome}.")
+        candidatos = self.resumos[nome].mais_frequentes(self.resumos[nome].capacidade)
+        superiores = self.esbocos[nome].estimar([chave for chave, _, _ in candidatos]).tolist()
+        linhas = [
+            (chave, min(superior, cm), inferior, min(superior, cm))
+            for (chave, inferior, superior), cm in zip(candidatos, superiores)
+        ]
+        linhas.sort(key=lambda linha: (-linha[1], -linha[2], str(linha[0])))
+        return linhas[:n]
+
+    def erros_maximos(self):
+        """
+        Erro máximo de cada ranking: o menor entre o do Space-Saving (garantido) e o do
+        Count-Min (válido com probabilidade 1 - delta).
+        """
+        return {
+            nome: min(self.resumos[nome].descontado, self.esbocos[nome].erro_maximo())
+            for nome in self.RANKINGS
+        }
+
+    def taxa_falsos_positivos(self):
+        return self.filtro.taxa_falsos_positivos()
+
+
+def top_n_em_fluxo(caminho_arquivo, n=10, linhas_por_bloco=5000, **parametros):
+    """
+    Lê o CSV de títulos em blocos de ``linhas_por_bloco`` linhas, com a mesma limpeza
+    de ``processar_arquivo``, e devolve o ``TopNEmFluxo`` preenchido junto com
+    {ranking: top ``n``}. ``parametros`` vão para o construtor de ``TopNEmFluxo``.
+    """
+    fluxo = TopNEmFluxo(**parametros)
+    for bloco in pd.read_csv(caminho_arquivo, usecols=['director', 'cast'], chunksize=linhas_por_bloco):
+        bloco = bloco.dropna(subset=['director', 'cast'])
+        fluxo.adicionar_obras(
+            ([limpar_string(d) for d in diretores.split(',')], [limpar_string(a) for a in elenco.split(',')])
+            for diretores, elenco in zip(bloco['director'], bloco['cast'])
+        )
+    return fluxo, {nome: fluxo.top_n(nome, n) for nome in TopNEmFluxo.RANKINGS}
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .csr import GrafoCSR
+from .persistencia import carregar_objeto, salvar_objeto
+from .processador_dados import limpar_string
+
+# Os pares (u, v) são guardados como uma chave int64 única: u nos 32 bits altos, v nos baixos
+_MASCARA = (1 << 32) - 1
+
+_pares_cache = {}
+
+
+def _pares(k):
+    """Índices (i, j), i < j, de todos os pares de um elenco de tamanho k."""
+    if k not in _pares_cache:
+        _pares_cache[k] = np.triu_indices(k, 1)
+    return _pares_cache[k]
+
+
+def _mapear(caminho, dtype, tamanho):
+    """Abre um arquivo binário cru como array somente leitura mapeado em memória."""
+    if tamanho == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(caminho, dtype=dtype, mode="r", shape=(tamanho,))
+
+
+def _agregar(chaves, pesos):
+    """Ordena por chave e soma os pesos de chaves repetidas."""
+    ordem = np.argsort(chaves, kind="stable")
+    chaves = chaves[ordem]
+    pesos = pesos[ordem]
+    inicios = np.flatnonzero(np.concatenate(([True], chaves[1:] != chaves[:-1])))
+    return chaves[inicios], np.add.reduceat(pesos, inicios)
+
+
+class _OrdenacaoExterna:
+    """
+    Ordenação externa de chaves de arestas com agregação de pesos.
+
+    As chaves recebidas ficam num buffer de até ``capacidade`` entradas; quando ele
+    enche, é ordenado, agregado (contagem de repetições = peso) e gravado em disco
+    como um "run". ``blocos()`` intercala os runs (em várias passadas, se houver mais
+    de ``aridade``) e gera blocos ordenados e já agregados.
+    """
+
+    def __init__(self, diretorio, capacidade, aridade=64):
+        os.makedirs(diretorio, exist_ok=True)
+        self.diretorio = diretorio
+        self.capacidade = capacidade
+        self.aridade = aridade
+        self.buffer = []
+        self.no_buffer = 0
+        self.runs = []
+        self._contador = 0
+
+    def adicionar(self, chaves):
+        self.buffer.append(chaves)
+        self.no_buffer += len(chaves)
+        if self.no_buffer >= self.capacidade:
+            self._despejar()
+
+    def _despejar(self):
+        if not self.buffer:
+            return
+        chaves, pesos = np.unique(np.concatenate(self.buffer), return_counts=True)
+        self.buffer = []
+        self.no_buffer = 0
+        self.runs.append(self._gravar_run([(chaves, pesos.astype(np.float64))]))
+
+    def _gravar_run(self, blocos):
+        base = os.path.join(self.diretorio, f"run{self._contador}")
+        self._contador += 1
+        tamanho = 0
+        with open(base + ".chaves", "wb") as fc, open(base + ".pesos", "wb") as fp:
+            for chaves, pesos in blocos:
+                fc.write(chaves.astype(np.int64).tobytes())
+                fp.write(pesos.astype(np.float64).tobytes())
+                tamanho += len(chaves)
+        return base, tamanho
+
+    def _remover(self, runs):
+        for base, _ in runs:
+            os.remove(base + ".chaves")
+            os.remove(base + ".pesos")
+
+    def _intercalar(self, runs):
+        """
+        Intercalação k-way: em cada passo lê um bloco de cada run e consome, de todos,
+        as chaves até a menor das últimas chaves lidas; nenhuma chave fica dividida
+        entre dois blocos gerados.
+        """
+        chaves = [_mapear(base + ".chaves", np.int64, t) for base, t in runs]
+        pesos = [_mapear(base + ".pesos", np.float64, t) for base, t in runs]
+        posicoes = [0] * len(runs)
+        bloco = max(self.capacidade // max(len(runs), 1), 1)
+
+        while True:
+            ativos = [i for i in range(len(runs)) if posicoes[i] < len(chaves[i])]
+            if not ativos:
+                return
+            fins = {i: min(posicoes[i] + bloco, len(chaves[i])) for i in ativos}
+            limite = min(chaves[i][fins[i] - 1] for i in ativos)
+
+            partes_c, partes_p = [], []
+            for i in ativos:
+                inicio = posicoes[i]
+                corte = inicio + int(np.searchsorted(chaves[i][inicio:fins[i]], limite, side="right"))
+                partes_c.append(np.asarray(chaves[i][inicio:corte]))
+                partes_p.append(np.asarray(pesos[i][inicio:corte]))
+                posicoes[i] = corte
+            yield _agregar(np.concatenate(partes_c), np.concatenate(partes_p))
+
+    def blocos(self):
+        """Gera (chaves, pesos) ordenados e agregados, em ordem crescente de chave."""
+        self._despejar()
+        runs = self.runs
+        while len(runs) > self.aridade:
+            novos = []
+            for i in range(0, len(runs), self.aridade):
+                grupo = runs[i:i + self.aridade]
+                novos.append(self._gravar_run(self._intercalar(grupo)))
+                self._remover(grupo)
+            runs = novos
+        yield from self._intercalar(runs)
+        self._remover(runs)
+        self.runs = []
+
+
+def _gravar_csr(ordenacao, n, diretorio, prefixo=""):
+    """Grava o resultado da ordenação externa como arrays CSR em disco (indptr, indices, pesos)."""
+    contagem = np.zeros(n, dtype=np.int64)
+    base = os.path.join(diretorio, prefixo)
+    with open(base + "indices.bin", "wb") as fi, open(base + "pesos.bin", "wb") as fp:
+        for chaves, pesos in ordenacao.blocos():
+            fi.write((chaves & _MASCARA).astype(np.int32).tobytes())
+            fp.write(pesos.tobytes())
+            contagem += np.bincount(chaves >> 32, minlength=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(contagem, out=indptr[1:])
+    np.save(base + "indptr.npy", indptr)
+
+
+def _abrir_csr(diretorio, prefixo=""):
+    base = os.path.join(diretorio, prefixo)
+    indptr = np.load(base + "indptr.npy")
+    m = int(indptr[-1])
+    return indptr, _mapear(base + "indices.bin", np.int32, m), _mapear(base + "pesos.bin", np.float64, m)
+
+
+def carregar_csr_mapeado(diretorio):
+    """
+    Abre um grafo gravado por ``construir_fora_de_memoria``. ``indices`` e ``pesos``
+    ficam mapeados em memória (np.memmap): só as páginas efetivamente percorridas
+    pelos algoritmos são lidas do disco.
+    """
+    vertices = carregar_objeto(os.path.join(diretorio, "vertices.pkl"))
+    indptr, indices, pesos = _abrir_csr(diretorio)
+    if os.path.exists(os.path.join(diretorio, "entrada_indptr.npy")):
+        ent_indptr, ent_indices, _ = _abrir_csr(diretorio, "entrada_")
+        entrada = (ent_indptr, ent_indices)
+    else:
+        entrada = (indptr, indices)
+    return GrafoCSR(vertices, indptr, indices, pesos, entrada=entrada)
+
+
+def construir_fora_de_memoria(caminho_arquivo, diretorio_saida, orcamento_mb=256, linhas_por_bloco=10000):
+    """
+    Constrói os grafos de ``processar_arquivo`` sem montar os dicionários em memória.
+
+    O CSV é lido em blocos de ``linhas_por_bloco`` linhas; os pares (ator, ator) e
+    (ator, diretor) gerados são despejados em runs ordenados em disco sempre que o
+    buffer atinge o limite derivado de ``orcamento_mb``, e depois intercalados e
+    agregados por ordenação externa. O resultado são grafos CSR gravados em
+    ``diretorio_saida/direcionado`` e ``diretorio_saida/nao_direcionado`` (com a
+    transposta do direcionado), equivalentes a ``grafo.obter_csr()`` dos grafos
+    em memória, inclusive na ordem dos vértices.
+
+    O orçamento limita os buffers de pares e de intercalação (valor aproximado); a
+    tabela de nomes dos vértices continua em memória.
+
+    Retorna (csr_direcionado, csr_nao_direcionado), abertos com ``carregar_csr_mapeado``.
+    """
+    if orcamento_mb <= 0:
+        raise ValueError("O orçamento de memória deve ser positivo.")
+    print("Iniciando a construção fora de memória...")
+
+    os.makedirs(diretorio_saida, exist_ok=True)
+    # Cada chave ocupa 8 bytes no buffer; ordenar/agregar usa algumas cópias temporárias,
+    # e há três ordenações (não-direcionado, direcionado e transposta) acumulando ao mesmo tempo.
+    capacidade = max(orcamento_mb * 2 ** 20 // (3 * 8 * 4), 1024)
+    temporario = tempfile.mkdtemp(prefix="runs_", dir=diretorio_saida)
+
+    try:
+        nao_dir = _OrdenacaoExterna(os.path.join(temporario, "nao_direcionado"), capacidade)
+        direto = _OrdenacaoExterna(os.path.join(temporario, "direcionado"), capacidade)
+        transposta = _OrdenacaoExterna(os.path.join(temporario, "entrada"), capacidade)
+        # Ids atribuídos na mesma ordem em que Grafo.adicionar_aresta criaria os vértices
+        ids_und = {}
+        ids_dir = {}
+
+        leitor = pd.read_csv(caminho_arquivo, usecols=["director", "cast"], chunksize=linhas_por_bloco)
+        for df in leitor:
+            df = df.dropna(subset=["director", "cast"])
+            for diretores_brutos, elenco_brutos in zip(df["director"], df["cast"]):
+                diretores = [limpar_string(d) for d in diretores_brutos.split(",")]
+                elenco = [limpar_string(a) for a in elenco_brutos.split(",")]
+
+                ids_dir.setdefault(elenco[0], len(ids_dir))
+                d = np.array([ids_dir.setdefault(x, len(ids_dir)) for x in diretores], dtype=np.int64)
+                a = np.array([ids_dir.setdefault(x, len(ids_dir)) for x in elenco], dtype=np.int64)
+                direto.adicionar((np.repeat(a, len(d)) << 32) | np.tile(d, len(a)))
+                transposta.adicionar((np.tile(d, len(a)) << 32) | np.repeat(a, len(d)))
+
+                if len(elenco) >= 2:
+                    c = np.array([ids_und.setdefault(x, len(ids_und)) for x in elenco], dtype=np.int64)
+                    i, j = _pares(len(elenco))
+                    u, v = c[i], c[j]
+                    nao_dir.adicionar(np.concatenate(((u << 32) | v, (v << 32) | u)))
+
+        saida_und = os.path.join(diretorio_saida, "nao_direcionado")
+        saida_dir = os.path.join(diretorio_saida, "direcionado")
+        for saida, ids in ((saida_und, ids_und), (saida_dir, ids_dir)):
+            os.makedirs(saida, exist_ok=True)
+            salvar_objeto(list(ids), os.path.join(saida, "vertices.pkl"))
+        _gravar_csr(nao_dir, len(ids_und), saida_und)
+        _gravar_csr(direto, len(ids_dir), saida_dir)
+        _gravar_csr(transposta, len(ids_dir), saida_dir, "entrada_")
+    finally:
+        shutil.rmtree(temporario, ignore_errors=True)
+
+    print("Construção fora de memória finalizada.")
+    return carregar_csr_mapeado(saida_dir), carregar_csr_mapeado(saida_und)
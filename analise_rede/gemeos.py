@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+from collections import deque
+
+
+class GrafoComprimido:
+    """
+    Grafo não-direcionado reduzido para o cálculo exato de betweenness.
+
+    1. Árvores penduradas (cadeias de vértices de grau 1) são podadas; cada vértice
+       restante guarda seu ``alcance``: ele mesmo mais os vértices pendurados nele.
+    2. Vértices restantes com a mesma vizinhança (aberta ou fechada) e o mesmo
+       alcance formam uma classe de gêmeos, representada por um único super-vértice
+       com multiplicidade ``mult``.
+    """
+
+    def __init__(self, graph):
+        self.vertices = list(graph)
+        n = len(self.vertices)
+        posicao_de = {v: i for i, v in enumerate(self.vertices)}
+        adj = [[posicao_de[w] for w in graph[v] if w != v] for v in self.vertices]
+        self.n = n
+
+        # Tamanho da componente conexa de cada vértice
+        componente = [-1] * n
+        tamanhos = []
+        for inicio in range(n):
+            if componente[inicio] >= 0:
+                continue
+            cid = len(tamanhos)
+            componente[inicio] = cid
+            pilha = [inicio]
+            tamanho = 0
+            while pilha:
+                u = pilha.pop()
+                tamanho += 1
+                for w in adj[u]:
+                    if componente[w] < 0:
+                        componente[w] = cid
+                        pilha.append(w)
+            tamanhos.append(tamanho)
+        self.tamanho_componente = [tamanhos[c] for c in componente]
+
+        # --- Poda das árvores penduradas ---
+        grau = [len(nbrs) for nbrs in adj]
+        alcance = [1] * n
+        removido = [False] * n
+        filhos = [[] for _ in range(n)]
+        fila = deque(v for v in range(n) if grau[v] == 1)
+        while fila:
+            u = fila.popleft()
+            if grau[u] != 1:
+                continue
+            p = next(w for w in adj[u] if not removido[w])
+            removido[u] = True
+            grau[u] = 0
+            filhos[p].append(u)
+            alcance[p] += alcance[u]
+            grau[p] -= 1
+            if grau[p] == 1:
+                fila.append(p)
+        self.alcance = alcance
+        self.removido = removido
+        self.filhos = filhos
+
+        # --- Classes de gêmeos entre os vértices restantes ---
+        nucleo = [v for v in range(n) if not removido[v]]
+        adj_nucleo = {v: [w for w in adj[v] if not removido[w]] for v in nucleo}
+
+        por_chave = {}
+        for v in nucleo:
+            chave = (frozenset(adj_nucleo[v]) | {v}, alcance[v])
+            por_chave.setdefault(chave, []).append(v)
+        grupos = []
+        sobras = []
+        for membros in por_chave.values():
+            (grupos if len(membros) > 1 else sobras).append(membros)
+        verdadeiros = len(grupos)
+        por_chave = {}
+        for (v,) in sobras:
+            por_chave.setdefault((frozenset(adj_nucleo[v]), alcance[v]), []).append(v)
+        grupos.extend(por_chave.values())
+
+        self.classe = [-1] * n
+        self.membros = grupos
+        # gêmeos verdadeiros (vizinhança fechada igual) são adjacentes entre si
+        self.gemeos_adjacentes = [i < verdadeiros and len(g) > 1 for i, g in enumerate(grupos)]
+        for c, membros in enumerate(grupos):
+            for v in membros:
+                self.classe[v] = c
+        self.mult = [len(g) for g in grupos]
+        self.alcance_classe = [alcance[g[0]] for g in grupos]
+        self.adj_classes = [
+            sorted({self.classe[w] for w in adj_nucleo[g[0]]} - {c}) for c, g in enumerate(grupos)
+        ]
+
+    def numero_classes(self):
+        return len(self.membros)
+
+
+def _dependencias_por_classe(comp):
+    """
+    Brandes sobre o grafo de classes, uma BFS por classe de origem.
+
+    Contagens de caminhos (sigma) e dependências (delta) são por membro; cada
+    classe pesa ``mult`` vezes na propagação e os alvos pesam seu ``alcance``.
+    O restante da classe de origem (sem a própria fonte) entra como um nó extra.
+    """
+    nq = comp.numero_classes()
+    mult = comp.mult
+    alcance = comp.alcance_classe
+    adj = comp.adj_classes
+    resto = nq
+    acumulado = [0.0] * nq
+
+    dist = [-1] * (nq + 1)
+    sigma = [0.0] * (nq + 1)
+    delta = [0.0] * (nq + 1)
+    preds = [[] for _ in range(nq + 1)]
+
+    for s in range(nq):
+        tem_resto = mult[s] > 1
+
+        def vizinhos(x):
+            if x == s or x == resto:
+                if comp.gemeos_adjacentes[s]:
+                    yield resto if x == s else s
+                for y in adj[s]:
+                    yield y
+                return
+            for y in adj[x]:
+                if y == s:
+                    if tem_resto:
+                        yield resto
+                else:
+                    yield y
+
+        def peso(x):
+            if x == s:
+                return 1
+            if x == resto:
+                return mult[s] - 1
+            return mult[x]
+
+        dist[s] = 0
+        sigma[s] = 1.0
+        ordem = []
+        fila = deque([s])
+        while fila:
+            x = fila.popleft()
+            ordem.append(x)
+            mx = peso(x)
+            for y in vizinhos(x):
+                if dist[y] < 0:
+                    dist[y] = dist[x] + 1
+                    fila.append(y)
+                if dist[y] == dist[x] + 1:
+                    sigma[y] += sigma[x] * mx
+                    preds[y].append(x)
+
+        for w in reversed(ordem):
+            alvo = alcance[s] if w == resto else alcance[w]
+            coef = peso(w) * (alvo + delta[w]) / sigma[w]
+            for x in preds[w]:
+                delta[x] += sigma[x] * coef
+            if w != s and w != resto:
+                acumulado[w] += mult[s] * alcance[s] * delta[w]
+
+        for x in ordem:
+            dist[x] = -1
+            sigma[x] = 0.0
+            delta[x] = 0.0
+            preds[x] = []
+
+    return acumulado
+
+
+def intermediacao_exata_comprimida(graph):
+    """
+    Betweenness exata de todos os vértices de um grafo não-direcionado, calculada
+    sobre o grafo comprimido (``GrafoComprimido``) e expandida para cada vértice original.
+
+    Usa a mesma normalização de ``approx_betweenness_centrality_all``, de modo que o
+    resultado coincide com ``approx_betweenness_centrality_all(graph, k=len(graph))``.
+    """
+    N = len(graph)
+    if N < 3:
+        return {v: 0.0 for v in graph}
+    if not all(u in graph[w] for u in graph for w in graph[u]):
+        raise ValueError("A compressão por gêmeos exige um grafo não-direcionado.")
+
+    comp = GrafoComprimido(graph)
+    por_classe = _dependencias_por_classe(comp)
+
+    norm = (N - 1) * (N - 2) / 2.0
+    resultado = {}
+    for i, v in enumerate(comp.vertices):
+        # Pares com uma ponta pendurada em v (ou abaixo de v) passam por v
+        pendurados = comp.alcance[i] - 1
+        resto = comp.tamanho_componente[i] - comp.alcance[i]
+        ramos = sum(comp.alcance[f] ** 2 for f in comp.filhos[i])
+        betw = pendurados * pendurados - ramos + 2 * pendurados * resto
+        if not comp.removido[i]:
+            betw += por_classe[comp.classe[i]]
+        resultado[v] = betw / norm
+    return resultado
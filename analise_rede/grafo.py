@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import sys
 
 class Grafo:
     
@@ -8,6 +9,7 @@ class Grafo:
         self.lista_adj = {}
         self.num_vertices = 0
         self.num_arestas = 0
+        self._csr = None  # representação CSR em cache, descartada a cada alteração
         
 
     def obter_lista_adj(self):
@@ -19,6 +21,7 @@ class Grafo:
 
         if vertice not in self.lista_adj:
             self.lista_adj[vertice] = {}  # O valor agora é um dicionário para os vizinhos ponderados
+            self._csr = None
             self.num_vertices += 1
             return True
         return False
@@ -28,6 +31,7 @@ class Grafo:
         # Garante que ambos os vértices existam no grafo
         self.adicionar_vertice(u)
         self.adicionar_vertice(v)
+        self._csr = None
 
         # Adiciona a aresta u -> v
         if v not in self.lista_adj[u]:
@@ -48,6 +52,33 @@ class Grafo:
         
         return nova_aresta
 
+    def mesclar(self, outro, direcionado=False):
+
+        # Soma o grafo ``outro`` a este: vértices novos entram na ordem em que aparecem
+        # em ``outro`` e pesos de arestas repetidas são somados. Mesclar grafos parciais
+        # na ordem das fontes dá o mesmo resultado de adicionar todas as arestas aqui.
+        self._csr = None
+        novas = lacos = 0
+        for u, vizinhos in outro.lista_adj.items():
+            atuais = self.lista_adj.get(u)
+            if atuais is None:
+                # Vértice novo: a lista de vizinhos é copiada de uma vez
+                self.lista_adj[u] = dict(vizinhos)
+                self.num_vertices += 1
+                novas += len(vizinhos)
+                lacos += u in vizinhos
+                continue
+            for v, peso in vizinhos.items():
+                if v in atuais:
+                    atuais[v] += peso
+                else:
+                    atuais[v] = peso
+                    novas += 1
+                    lacos += u == v
+        # Sem direção, cada aresta nova aparece nos dois sentidos (lacos, uma vez só)
+        self.num_arestas += novas if direcionado else (novas - lacos) // 2 + lacos
+        return self
+
     def obter_numero_vertices(self):
 
         return self.num_vertices
@@ -56,6 +87,47 @@ class Grafo:
 
         return self.num_arestas
 
+    def obter_csr(self):
+
+        # Arrays inteiros (GrafoCSR) usados pelos kernels vetorizados; construídos uma vez
+        # e reaproveitados enquanto o grafo não for alterado.
+        if self._csr is None:
+            from .csr import GrafoCSR
+            self._csr = GrafoCSR.de_lista_adj(self.lista_adj)
+        return self._csr
+
+    def uso_memoria(self):
+
+        # Bytes aproximados (sys.getsizeof) de cada parte do grafo. Cada nome de vértice é
+        # contado uma vez, na tabela de vértices, embora também seja chave nos vizinhos.
+        tabela_vertices = sys.getsizeof(self.lista_adj) + sum(sys.getsizeof(v) for v in self.lista_adj)
+        adjacencia = 0
+        for vizinhos in self.lista_adj.values():
+            adjacencia += sys.getsizeof(vizinhos) + sum(sys.getsizeof(p) for p in vizinhos.values())
+        uso = {'tabela_vertices': tabela_vertices, 'adjacencia': adjacencia}
+        if self._csr is not None:
+            uso['csr'] = self._csr.indptr.nbytes + self._csr.indices.nbytes + self._csr.pesos.nbytes
+        uso['total'] = sum(uso.values())
+        return uso
+
+    def congelar(self):
+
+        # Snapshot imutável (GrafoCSR congelado) para consultas em várias threads. É uma
+        # cópia: o cache CSR deste Grafo continua gravável e alterações posteriores não o afetam.
+        return self.obter_csr().copia_congelada()
+
+    def __getstate__(self):
+
+        # O cache CSR não vai para snapshots em disco; é reconstruído sob demanda.
+        estado = self.__dict__.copy()
+        estado['_csr'] = None
+        return estado
+
+    def __setstate__(self, estado):
+
+        estado.setdefault('_csr', None)
+        self.__dict__.update(estado)
+
     def obter_vertices(self):
 
         return list(self.lista_adj.keys())
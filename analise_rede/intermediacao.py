@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+from collections import deque
+
+import numpy as np
+
+from .bfs import BuscaEmLargura
+from .csr import GrafoCSR
+from .persistencia import carregar_objeto, impressao_digital, salvar_objeto
+
+
+class SessaoIntermediacao:
+    """
+    Betweenness amostrada reutilizável.
+
+    As k fontes amostradas são processadas uma única vez por (versão do grafo, k, seed)
+    e o vetor de dependências acumulado fica guardado; cada consulta posterior por
+    vértice é apenas uma leitura. Com ``diretorio_cache``, o vetor também é salvo em
+    disco e reaproveitado em execuções futuras sobre o mesmo grafo.
+
+    ``intermediacao(v)`` retorna o mesmo valor de ``approx_betweenness_centrality(graph, v, k, seed)``.
+    """
+
+    def __init__(self, graph, k=50, seed=42, diretorio_cache=None):
+        self.k = k
+        self.seed = seed
+        self.impressao = impressao_digital(graph)
+        self.N = len(graph)
+        self.acumulado = None
+
+        caminho = None
+        if diretorio_cache is not None:
+            os.makedirs(diretorio_cache, exist_ok=True)
+            nome = f"intermediacao_{self.impressao[:16]}_k{k}_s{seed}.pkl"
+            caminho = os.path.join(diretorio_cache, nome)
+            if os.path.exists(caminho):
+                dados = carregar_objeto(caminho)
+                if (dados["impressao"], dados["k"], dados["seed"]) == (self.impressao, k, seed):
+                    self.num_fontes = dados["num_fontes"]
+                    self.acumulado = dados["acumulado"]
+
+        if self.acumulado is None:
+            self._calcular(graph)
+            if caminho is not None:
+                salvar_objeto(
+                    {
+                        "impressao": self.impressao,
+                        "k": k,
+                        "seed": seed,
+                        "num_fontes": self.num_fontes,
+                        "acumulado": self.acumulado,
+                    },
+                    caminho,
+                )
+
+    def _calcular(self, graph):
+        nodes = list(graph.keys())
+        acumulado = {v: 0.0 for v in nodes}
+        if self.N < 3:
+            self.num_fontes = 0
+            self.acumulado = acumulado
+            return
+
+        random.seed(self.seed)
+        fontes = random.sample(nodes, min(self.k, self.N))
+        self.num_fontes = len(fontes)
+
+        if isinstance(graph, GrafoCSR):
+            # Passos de Brandes pelo kernel vetorizado
+            busca = BuscaEmLargura(graph)
+            vetor = np.zeros(self.N)
+            for s in fontes:
+                i = graph.indice[s]
+                niveis = busca.dependencias(i)
+                busca.delta[i] = 0.0
+                visitados = np.concatenate(niveis)
+                vetor[visitados] += busca.delta[visitados]
+                busca.limpar(niveis)
+            self.acumulado = dict(zip(nodes, vetor.tolist()))
+            return
+
+        for s in fontes:
+            dist = {s: 0}
+            sigma = {s: 1}
+            P = {s: []}
+            queue = deque([s])
+            order = []
+
+            while queue:
+                v = queue.popleft()
+                order.append(v)
+                for w in graph[v]:
+                    if w not in dist:
+                        dist[w] = dist[v] + 1
+                        sigma[w] = 0
+                        P[w] = []
+                        queue.append(w)
+                    if dist[w] == dist[v] + 1:
+                        sigma[w] += sigma[v]
+                        P[w].append(v)
+
+            delta = {v: 0.0 for v in order}
+            for w in reversed(order):
+                for u in P[w]:
+                    delta[u] += (sigma[u] / sigma[w]) * (1 + delta[w])
+                if w != s:
+                    acumulado[w] += delta[w]
+
+        self.acumulado = acumulado
+
+    def intermediacao(self, v):
+        """Betweenness aproximada de ``v`` (0–1), com a normalização de ``approx_betweenness_centrality``."""
+        if v not in self.acumulado:
+            raise ValueError(f"Vértice {v} não existe no grafo.")
+        if self.N < 3 or self.num_fontes == 0:
+            return 0.0
+        norm = (self.N - 1) * (self.N - 2) / 2
+        return (self.acumulado[v] * self.N / self.num_fontes) / norm
+
+    def todas(self):
+        """Dicionário {vértice: betweenness aproximada} para todos os vértices."""
+        return {v: self.intermediacao(v) for v in self.acumulado}
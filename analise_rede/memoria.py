@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import tracemalloc
+from contextlib import contextmanager
+
+
+def formatar_bytes(num_bytes):
+    return f"{num_bytes / 2 ** 20:.1f} MB"
+
+
+class OrcamentoDeMemoriaExcedido(MemoryError):
+    """Memória rastreada acima do orçamento. ``relatorio`` traz o consumo registrado até o momento."""
+
+    def __init__(self, mensagem, relatorio):
+        super().__init__(f"{mensagem}\n{relatorio}")
+        self.relatorio = relatorio
+
+
+class MonitorMemoria:
+    """
+    Acompanha o consumo de memória de um processamento longo com ``tracemalloc``.
+
+    Cada ``fase(nome)`` registra a memória rastreada ao final e o pico durante a fase;
+    ``registrar`` guarda tamanhos medidos à parte (ex.: o DataFrame de ingestão). Com
+    ``orcamento_mb``, ``verificar()`` interrompe o processamento com
+    ``OrcamentoDeMemoriaExcedido`` assim que a memória rastreada, somada aos tamanhos
+    registrados com ``externo=True`` (buffers que o tracemalloc não vê, como os do
+    pyarrow), passa do orçamento.
+    Inativo (sem orçamento e ``ativo=False``), todas as operações são no-ops.
+    """
+
+    def __init__(self, orcamento_mb=None, ativo=False):
+        self.orcamento = None if orcamento_mb is None else int(orcamento_mb * 2 ** 20)
+        self.ativo = ativo or orcamento_mb is not None
+        self.fases = []
+        self.tamanhos = {}
+        self._externos = set()
+        self._fase_atual = None
+        self._iniciou = False
+
+    def iniciar(self):
+        if self.ativo and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou = True
+
+    def parar(self):
+        if self._iniciou:
+            tracemalloc.stop()
+            self._iniciou = False
+
+    @contextmanager
+    def fase(self, nome):
+        if not self.ativo:
+            yield
+            return
+        tracemalloc.reset_peak()
+        self._fase_atual = nome
+        try:
+            yield
+        finally:
+            atual, pico = tracemalloc.get_traced_memory()
+            self.fases.append((nome, atual, pico))
+            self._fase_atual = None
+
+    def registrar(self, nome, num_bytes, externo=False):
+        if self.ativo:
+            self.tamanhos[nome] = num_bytes
+            if externo:
+                self._externos.add(nome)
+
+    def verificar(self, contexto=""):
+        if self.orcamento is None:
+            return
+        atual, _ = tracemalloc.get_traced_memory()
+        atual += sum(self.tamanhos[nome] for nome in self._externos)
+        if atual > self.orcamento:
+            onde = f" ({contexto})" if contexto else ""
+            raise OrcamentoDeMemoriaExcedido(
+                f"Orçamento de memória de {formatar_bytes(self.orcamento)} excedido{onde}: "
+                f"{formatar_bytes(atual)} em uso. Para catálogos deste tamanho, use "
+                f"fora_de_memoria.construir_fora_de_memoria.",
+                self.relatorio(),
+            )
+
+    def relatorio(self):
+        """Texto com o consumo por fase e os tamanhos registrados."""
+        linhas = ["Relatório de memória:"]
+        if self.orcamento is not None:
+            linhas.append(f"  orçamento: {formatar_bytes(self.orcamento)}")
+        for nome, atual, pico in self.fases:
+            linhas.append(f"  fase '{nome}': pico {formatar_bytes(pico)}, ao final {formatar_bytes(atual)}")
+        if self._fase_atual is not None and tracemalloc.is_tracing():
+            atual, pico = tracemalloc.get_traced_memory()
+            linhas.append(
+                f"  fase '{self._fase_atual}' (interrompida): pico {formatar_bytes(pico)}, "
+                f"atual {formatar_bytes(atual)}"
+            )
+        for nome, num_bytes in self.tamanhos.items():
+            linhas.append(f"  {nome}: {formatar_bytes(num_bytes)}")
+        return "\n".join(linhas)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from .grafo import Grafo
+
+
+def decomposicao_k_core(graph):
+    """
+    Número de núcleo (core number) de cada vértice de um grafo não-direcionado.
+
+    Algoritmo de Batagelj–Zaversnik: os vértices ficam em baldes por grau e são
+    removidos em ordem crescente de grau, em O(V + E).
+    Retorna {vértice: core}.
+    """
+    vertices = list(graph)
+    n = len(vertices)
+    if n == 0:
+        return {}
+    posicao_de = {v: i for i, v in enumerate(vertices)}
+    adj = [[posicao_de[w] for w in graph[v] if w != v] for v in vertices]
+    grau = [len(nbrs) for nbrs in adj]
+
+    # Início de cada balde de grau no vetor ordenado
+    grau_max = max(grau)
+    balde = [0] * (grau_max + 1)
+    for d in grau:
+        balde[d] += 1
+    inicio = 0
+    for d in range(grau_max + 1):
+        quantidade = balde[d]
+        balde[d] = inicio
+        inicio += quantidade
+
+    pos = [0] * n
+    ordem = [0] * n
+    for v in range(n):
+        pos[v] = balde[grau[v]]
+        ordem[pos[v]] = v
+        balde[grau[v]] += 1
+    for d in range(grau_max, 0, -1):
+        balde[d] = balde[d - 1]
+    balde[0] = 0
+
+    for i in range(n):
+        v = ordem[i]
+        for u in adj[v]:
+            if grau[u] > grau[v]:
+                # Move u para o início do seu balde e decrementa seu grau
+                du = grau[u]
+                pu = pos[u]
+                pw = balde[du]
+                w = ordem[pw]
+                if u != w:
+                    pos[u], pos[w] = pw, pu
+                    ordem[pu], ordem[pw] = w, u
+                balde[du] += 1
+                grau[u] -= 1
+
+    return {vertices[i]: grau[i] for i in range(n)}
+
+
+def subgrafo_k_core(graph, k, nucleos=None):
+    """
+    Dicionário de adjacência do k-core: vértices com core >= k e as arestas entre eles.
+    ``nucleos`` pode ser o resultado já calculado de ``decomposicao_k_core``.
+    """
+    if nucleos is None:
+        nucleos = decomposicao_k_core(graph)
+    return {
+        v: {w: peso for w, peso in graph[v].items() if nucleos.get(w, 0) >= k}
+        for v in graph
+        if nucleos.get(v, 0) >= k
+    }
+
+
+def _como_grafo(lista_adj):
+    """Envolve a lista de adjacência (não-direcionada) de um subgrafo num ``Grafo``."""
+    grafo = Grafo()
+    grafo.lista_adj = lista_adj
+    grafo.num_vertices = len(lista_adj)
+    entradas = sum(len(nbrs) for nbrs in lista_adj.values())
+    lacos = sum(1 for v, nbrs in lista_adj.items() if v in nbrs)
+    grafo.num_arestas = (entradas - lacos) // 2 + lacos
+    return grafo
+
+
+def executar_no_k_core(funcao, graph, *args, k_minimo, nucleos=None, **kwargs):
+    """
+    Executa ``funcao`` apenas sobre o k-core (core >= ``k_minimo``) de ``graph``; os
+    demais argumentos são repassados a ``funcao``. Se ``graph`` for um ``Grafo``, o
+    subgrafo também é entregue como ``Grafo`` (para as funções em lote); se for uma
+    lista de adjacência, como dicionário.
+
+    Ex.: ``executar_no_k_core(approx_betweenness_centrality_all, grafo_und.lista_adj, k_minimo=5, k=100)``
+    """
+    if isinstance(graph, Grafo):
+        return funcao(_como_grafo(subgrafo_k_core(graph.lista_adj, k_minimo, nucleos)), *args, **kwargs)
+    return funcao(subgrafo_k_core(graph, k_minimo, nucleos), *args, **kwargs)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import pickle
+
+
+def impressao_digital(graph):
+    """Hash SHA-1 do conteúdo do grafo (vértices, arestas e pesos), independente da ordem de inserção."""
+    h = hashlib.sha1()
+    for v in sorted(graph, key=repr):
+        h.update(repr(v).encode("utf-8"))
+        h.update(b"\x00")
+        for w, peso in sorted(graph[v].items(), key=lambda item: repr(item[0])):
+            h.update(repr(w).encode("utf-8"))
+            h.update(b"\x01")
+            h.update(repr(peso).encode("utf-8"))
+            h.update(b"\x02")
+        h.update(b"\x03")
+    return h.hexdigest()
+
+
+def caminho_ao_lado(caminho_grafo, extensao):
+    """Caminho de um arquivo auxiliar guardado ao lado do snapshot (ex.: 'grafo.pkl' -> 'grafo.pll')."""
+    base, _ = os.path.splitext(caminho_grafo)
+    return f"{base}.{extensao}"
+
+
+def salvar_objeto(objeto, caminho):
+    """Grava ``objeto`` com pickle de forma atômica (arquivo temporário + rename)."""
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as f:
+        pickle.dump(objeto, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, caminho)
+
+
+def carregar_objeto(caminho):
+    with open(caminho, "rb") as f:
+        return pickle.load(f)
+
+
+def salvar_grafo(grafo, caminho):
+    """Salva um snapshot do ``Grafo`` em disco."""
+    salvar_objeto(grafo, caminho)
+
+
+def carregar_grafo(caminho):
+    """Carrega um snapshot de ``Grafo`` salvo com ``salvar_grafo``."""
+    return carregar_objeto(caminho)
+
+
+def salvar_checkpoint(caminho, impressao, parametros, estado):
+    """Grava o progresso parcial de um cálculo longo, identificado pelo grafo e pelos parâmetros."""
+    salvar_objeto({"impressao": impressao, "parametros": parametros, "estado": estado}, caminho)
+
+
+def carregar_checkpoint(caminho, impressao, parametros):
+    """
+    Retorna o estado salvo em ``caminho`` se ele foi gerado sobre o mesmo grafo e com
+    os mesmos parâmetros; caso contrário (ou se o arquivo não existir), None.
+    """
+    if not os.path.exists(caminho):
+        return None
+    dados = carregar_objeto(caminho)
+    if dados.get("impressao") != impressao or dados.get("parametros") != parametros:
+        print(f"Checkpoint '{caminho}' é de outro grafo ou de outros parâmetros; ignorando.")
+        return None
+    return dados["estado"]
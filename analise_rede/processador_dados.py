@@ -1,42 +1,225 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 from .grafo import Grafo 
+from .memoria import MonitorMemoria
+
+# Extensões tratadas pelo caminho colunar (Parquet / Arrow IPC)
+EXTENSOES_COLUNARES = ('.parquet', '.arrow', '.feather')
+
+PAPEL_DIRETOR = 0
+PAPEL_ELENCO = 1
+
+# Intervalo (em obras) entre verificações do orçamento de memória
+OBRAS_POR_VERIFICACAO = 1000
+
 
 def limpar_string(nome: str) -> str:
     return nome.strip().upper()
 
-def processar_arquivo(caminho_arquivo: str, grafo_direcionado: Grafo, grafo_nao_direcionado: Grafo):
+def _importar_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError as erro:
+        raise ImportError("O formato colunar requer o pacote 'pyarrow' (pip install pyarrow).") from erro
+    return pyarrow
+
+def processar_arquivo(caminho_arquivo: str, grafo_direcionado: Grafo, grafo_nao_direcionado: Grafo,
+                      orcamento_mb=None, medir_memoria=False):
+    """
+    Popula os dois grafos a partir do catálogo. Com ``medir_memoria`` (ou um
+    ``orcamento_mb``), o consumo de cada fase é medido com tracemalloc e um relatório
+    é impresso ao final; com ``orcamento_mb``, a construção é interrompida com
+    ``OrcamentoDeMemoriaExcedido`` assim que o orçamento é ultrapassado (o
+    tracemalloc deixa a construção algumas vezes mais lenta; sem esses parâmetros
+    nada é medido). Retorna o ``MonitorMemoria`` usado.
+    """
+    if caminho_arquivo.lower().endswith(EXTENSOES_COLUNARES):
+        return processar_arquivo_colunar(caminho_arquivo, grafo_direcionado, grafo_nao_direcionado,
+                                         orcamento_mb, medir_memoria)
+
     print("Iniciando o processamento do arquivo CSV...")
+    monitor = MonitorMemoria(orcamento_mb, medir_memoria)
+    monitor.iniciar()
+    try:
+        with monitor.fase('leitura'):
+            # Carrega o CSV usando pandas.
+            df = pd.read_csv(caminho_arquivo)
+
+            # Remove linhas onde 'director' ou 'cast' são vazios, conforme solicitado.
+            df.dropna(subset=['director', 'cast'], inplace=True)
+        if monitor.ativo:
+            monitor.registrar('DataFrame de ingestão', int(df.memory_usage(deep=True).sum()), externo=True)
+        monitor.verificar('leitura do CSV')
+
+        with monitor.fase('construção dos grafos'):
+            # Itera sobre cada linha (cada obra do catálogo)
+            for numero, (_, linha) in enumerate(df.iterrows(), 1):
+                # Extrai e limpa a lista de diretores e do elenco da obra atual
+                diretores_brutos = linha['director'].split(',')
+                elenco_brutos = linha['cast'].split(',')
+
+                diretores = [limpar_string(d) for d in diretores_brutos]
+                elenco = [limpar_string(a) for a in elenco_brutos]
+
+                _adicionar_obra(diretores, elenco, grafo_direcionado, grafo_nao_direcionado)
+                if numero % OBRAS_POR_VERIFICACAO == 0:
+                    monitor.verificar(f'obra {numero} de {len(df)}')
+        # As últimas obras (ou um catálogo inteiro com menos de OBRAS_POR_VERIFICACAO)
+        monitor.verificar('construção dos grafos')
+
+        _finalizar_medicao(monitor, grafo_direcionado, grafo_nao_direcionado)
+    finally:
+        monitor.parar()
+
+    print("Processamento do arquivo finalizado.")
+    return monitor
+
+def _construir_parcial(caminho_arquivo):
+    grafo_direcionado = Grafo()
+    grafo_nao_direcionado = Grafo()
+    processar_arquivo(caminho_arquivo, grafo_direcionado, grafo_nao_direcionado)
+    return grafo_direcionado, grafo_nao_direcionado
 
-    # Carrega o CSV usando pandas.
-    df = pd.read_csv(caminho_arquivo)
+def processar_arquivos(caminhos, grafo_direcionado: Grafo, grafo_nao_direcionado: Grafo, processos=None):
+    """
+    Popula os dois grafos a partir de vários catálogos (ex.: um CSV por plataforma),
+    cada um lido em um processo separado para um par de grafos parciais. Os parciais
+    são mesclados com ``Grafo.mesclar`` na ordem de ``caminhos``, o que dá exatamente
+    os grafos de ``processar_arquivo`` sobre a concatenação dos arquivos. Os arquivos
+    maiores são submetidos primeiro, para que o tempo total fique próximo ao do maior.
+    """
+    caminhos = list(caminhos)
+    if processos is None:
+        processos = min(len(caminhos), os.cpu_count() or 1)
 
-    # Remove linhas onde 'director' ou 'cast' são vazios, conforme solicitado.
+    def mesclar(parcial):
+        grafo_direcionado.mesclar(parcial[0], direcionado=True)
+        grafo_nao_direcionado.mesclar(parcial[1])
+
+    if processos <= 1 or len(caminhos) <= 1:
+        for caminho in caminhos:
+            mesclar(_construir_parcial(caminho))
+        return
+
+    por_tamanho = sorted(range(len(caminhos)), key=lambda i: os.path.getsize(caminhos[i]), reverse=True)
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {i: executor.submit(_construir_parcial, caminhos[i]) for i in por_tamanho}
+        # Cada parcial é mesclado assim que ele e os anteriores ficam prontos
+        for i in range(len(caminhos)):
+            mesclar(futuros.pop(i).result())
+
+def _finalizar_medicao(monitor, grafo_direcionado, grafo_nao_direcionado):
+    if not monitor.ativo:
+        return
+    for nome, grafo in (('grafo direcionado', grafo_direcionado), ('grafo não-direcionado', grafo_nao_direcionado)):
+        uso = grafo.uso_memoria()
+        monitor.registrar(f'{nome} - tabela de vértices', uso['tabela_vertices'])
+        monitor.registrar(f'{nome} - adjacências', uso['adjacencia'])
+    print(monitor.relatorio())
+
+def _adicionar_obra(diretores, elenco, grafo_direcionado, grafo_nao_direcionado):
+    # --- Populando o Grafo Direcionado (Ator -> Diretor) --- 
+    # Para cada ator e cada diretor na mesma obra, cria a relação ponderada.
+    for ator in elenco:
+        for diretor in diretores:
+            # A aresta é direcionada do ator para o diretor
+            grafo_direcionado.adicionar_aresta(ator, diretor, peso=1, direcionado=True)
+
+    # --- Populando o Grafo Não-Direcionado (Ator <-> Ator) --- 
+    # Gera todos os pares únicos de atores no mesmo elenco para criar as arestas.
+    # O laço começa com j = i + 1 para evitar arestas de um ator com ele mesmo e duplicatas.
+    for i in range(len(elenco)):
+        for j in range(i + 1, len(elenco)):
+            ator1 = elenco[i]
+            ator2 = elenco[j]
+            # A aresta é não-direcionada (padrão do método)
+            grafo_nao_direcionado.adicionar_aresta(ator1, ator2, peso=1)
+
+def converter_para_colunar(caminho_csv: str, caminho_saida: str):
+    """
+    Converte o CSV de títulos, uma única vez, para Parquet (ou Arrow IPC, se a extensão
+    for .arrow/.feather) em formato "explodido": uma linha por (obra, papel, pessoa),
+    com os nomes já normalizados por ``limpar_string`` e codificados em dicionário.
+    """
+    pa = _importar_pyarrow()
+    print("Convertendo o CSV para o formato colunar...")
+
+    df = pd.read_csv(caminho_csv, usecols=['director', 'cast'])
     df.dropna(subset=['director', 'cast'], inplace=True)
+    df['obra'] = np.arange(len(df), dtype=np.int32)
+
+    partes = []
+    for coluna, papel in (('director', PAPEL_DIRETOR), ('cast', PAPEL_ELENCO)):
+        nomes = df[['obra', coluna]].assign(pessoa=df[coluna].str.split(',')).explode('pessoa')
+        nomes['pessoa'] = nomes['pessoa'].str.strip().str.upper()
+        nomes['papel'] = np.int8(papel)
+        partes.append(nomes[['obra', 'papel', 'pessoa']])
+
+    # Ordem estável: por obra, diretores antes do elenco, mantendo a ordem original dos nomes
+    longo = pd.concat(partes).sort_values(['obra', 'papel'], kind='stable')
+    longo['pessoa'] = longo['pessoa'].astype('category')
+
+    tabela = pa.Table.from_pandas(longo, preserve_index=False)
+    if caminho_saida.lower().endswith('.parquet'):
+        pa.parquet.write_table(tabela, caminho_saida)
+    else:
+        pa.feather.write_feather(tabela, caminho_saida)
+    print(f"Arquivo colunar salvo em '{caminho_saida}' ({len(longo)} nomes, {len(df)} obras).")
+
+def processar_arquivo_colunar(caminho_arquivo: str, grafo_direcionado: Grafo, grafo_nao_direcionado: Grafo,
+                              orcamento_mb=None, medir_memoria=False):
+    """
+    Constrói os grafos a partir do arquivo gerado por ``converter_para_colunar``.
+    Lê apenas as colunas necessárias e trabalha com os códigos inteiros do dicionário
+    de nomes; cada nome é decodificado uma única vez. A medição de memória e o
+    orçamento funcionam como em ``processar_arquivo``.
+    """
+    pa = _importar_pyarrow()
+    print("Iniciando o processamento do arquivo colunar...")
+    monitor = MonitorMemoria(orcamento_mb, medir_memoria)
+    monitor.iniciar()
+    try:
+        with monitor.fase('leitura'):
+            colunas = ['obra', 'papel', 'pessoa']
+            if caminho_arquivo.lower().endswith('.parquet'):
+                tabela = pa.parquet.read_table(caminho_arquivo, columns=colunas)
+            else:
+                tabela = pa.feather.read_table(caminho_arquivo, columns=colunas)
+            tabela = tabela.unify_dictionaries()
+
+            pessoa = tabela.column('pessoa').combine_chunks()
+            if not pa.types.is_dictionary(pessoa.type):
+                pessoa = pessoa.dictionary_encode()
+            codigos = pessoa.indices.to_numpy(zero_copy_only=False)
+            nomes = pessoa.dictionary.to_pylist()
+            obra = tabela.column('obra').to_numpy()
+            papel = tabela.column('papel').to_numpy()
+        # A tabela Arrow fica fora do heap do Python; seu tamanho é informado à parte
+        monitor.registrar('tabela Arrow de ingestão', tabela.nbytes, externo=True)
+        monitor.verificar('leitura do arquivo colunar')
+
+        with monitor.fase('construção dos grafos'):
+            # Fronteiras entre obras consecutivas
+            inicios = np.concatenate(([0], np.flatnonzero(np.diff(obra)) + 1, [len(obra)]))
+            codigos = codigos.tolist()
+            papel = papel.tolist()
+            limites = list(zip(inicios[:-1].tolist(), inicios[1:].tolist()))
+            for numero, (a, b) in enumerate(limites, 1):
+                diretores = [nomes[codigos[i]] for i in range(a, b) if papel[i] == PAPEL_DIRETOR]
+                elenco = [nomes[codigos[i]] for i in range(a, b) if papel[i] == PAPEL_ELENCO]
+                _adicionar_obra(diretores, elenco, grafo_direcionado, grafo_nao_direcionado)
+                if numero % OBRAS_POR_VERIFICACAO == 0:
+                    monitor.verificar(f'obra {numero} de {len(limites)}')
+        monitor.verificar('construção dos grafos')
+
+        _finalizar_medicao(monitor, grafo_direcionado, grafo_nao_direcionado)
+    finally:
+        monitor.parar()
 
-    # Itera sobre cada linha (cada obra do catálogo)
-    for _, linha in df.iterrows():
-        # Extrai e limpa a lista de diretores e do elenco da obra atual
-        diretores_brutos = linha['director'].split(',')
-        elenco_brutos = linha['cast'].split(',')
-        
-        diretores = [limpar_string(d) for d in diretores_brutos]
-        elenco = [limpar_string(a) for a in elenco_brutos]
-
-        # --- Populando o Grafo Direcionado (Ator -> Diretor) --- 
-        # Para cada ator e cada diretor na mesma obra, cria a relação ponderada.
-        for ator in elenco:
-            for diretor in diretores:
-                # A aresta é direcionada do ator para o diretor
-                grafo_direcionado.adicionar_aresta(ator, diretor, peso=1, direcionado=True)
-
-        # --- Populando o Grafo Não-Direcionado (Ator <-> Ator) --- 
-        # Gera todos os pares únicos de atores no mesmo elenco para criar as arestas.
-        # O laço começa com j = i + 1 para evitar arestas de um ator com ele mesmo e duplicatas.
-        for i in range(len(elenco)):
-            for j in range(i + 1, len(elenco)):
-                ator1 = elenco[i]
-                ator2 = elenco[j]
-                # A aresta é não-direcionada (padrão do método)
-                grafo_nao_direcionado.adicionar_aresta(ator1, ator2, peso=1)
-
-    print("Processamento do arquivo finalizado.")
\ No newline at end of file
+    print("Processamento do arquivo finalizado.")
+    return monitor
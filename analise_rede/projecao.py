@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from .csr import como_csr
+from .grafo import Grafo
+
+
+def _importar_scipy():
+    try:
+        import scipy.sparse
+    except ImportError as erro:
+        raise ImportError("A projeção de diretores requer o pacote 'scipy' (pip install scipy).") from erro
+    return scipy.sparse
+
+
+def projetar_diretores(grafo_direcionado):
+    """
+    Grafo não-direcionado diretor-diretor: dois diretores são ligados quando
+    compartilham atores, com peso igual ao número de atores em comum.
+
+    Com B a matriz de incidência ator -> diretor (B[a, d] = 1 se a trabalhou com d),
+    os pesos são as entradas fora da diagonal do produto esparso Bᵀ B. Todos os
+    diretores do grafo direcionado aparecem como vértices, mesmo os isolados. O
+    resultado é um ``Grafo`` comum, aceito por todos os algoritmos.
+    """
+    sparse = _importar_scipy()
+    if isinstance(grafo_direcionado, Grafo):
+        csr = grafo_direcionado.obter_csr()
+    else:
+        csr = como_csr(grafo_direcionado)
+
+    n = len(csr)
+    incidencia = sparse.csr_matrix(
+        (np.ones(len(csr.indices), dtype=np.int64), csr.indices, csr.indptr), shape=(n, n)
+    )
+    # Diretores são os vértices com arestas de entrada
+    diretores = np.flatnonzero(np.bincount(csr.indices, minlength=n) > 0)
+    incidencia = incidencia[:, diretores]
+
+    coautoria = (incidencia.T @ incidencia).tocsr()
+    coautoria.setdiag(0)
+    coautoria.eliminate_zeros()
+    coautoria.sort_indices()
+
+    nomes = [csr.vertices[i] for i in diretores.tolist()]
+    indptr = coautoria.indptr.tolist()
+    indices = coautoria.indices.tolist()
+    pesos = coautoria.data.tolist()
+
+    grafo = Grafo()
+    for i, nome in enumerate(nomes):
+        a, b = indptr[i], indptr[i + 1]
+        grafo.lista_adj[nome] = {nomes[j]: p for j, p in zip(indices[a:b], pesos[a:b])}
+    grafo.num_vertices = len(nomes)
+    grafo.num_arestas = coautoria.nnz // 2
+    return grafo
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+import math
+import sys
+import time
+from array import array
+from collections import deque
+
+import numpy as np
+
+from .persistencia import caminho_ao_lado, carregar_objeto, impressao_digital, salvar_objeto
+
+_INF = sys.maxsize
+
+
+class RotulosPLL:
+    """
+    Oráculo de distâncias exatas por rotulação 2-hop (Pruned Landmark Labeling).
+
+    Cada vértice guarda um rótulo com pares (hub, distância); a distância entre
+    u e v é o mínimo de d(u,h) + d(h,v) sobre os hubs h comuns aos dois rótulos.
+    Os vértices são processados em ordem decrescente de grau e cada BFS é podada
+    assim que os rótulos já construídos respondem corretamente.
+    Vale para grafos não-direcionados e não ponderados (ex.: ``grafo_und.lista_adj``).
+    """
+
+    def __init__(self, graph):
+        inicio = time.perf_counter()
+
+        self.ordem = sorted(graph, key=lambda v: len(graph[v]), reverse=True)
+        self.posicao = {v: i for i, v in enumerate(self.ordem)}
+        self.impressao = impressao_digital(graph)
+
+        n = len(self.ordem)
+        adj = [[self.posicao[w] for w in graph[v]] for v in self.ordem]
+        hubs = [array("i") for _ in range(n)]
+        dists = [array("i") for _ in range(n)]
+
+        tmp = [_INF] * n
+        dist = [-1] * n
+        for r in range(n):
+            for h, d in zip(hubs[r], dists[r]):
+                tmp[h] = d
+
+            dist[r] = 0
+            visitados = [r]
+            fila = deque([r])
+            while fila:
+                u = fila.popleft()
+                d = dist[u]
+                # Poda: os rótulos atuais já dão uma distância <= d entre r e u
+                podar = False
+                for h, dh in zip(hubs[u], dists[u]):
+                    if tmp[h] + dh <= d:
+                        podar = True
+                        break
+                if podar:
+                    continue
+                hubs[u].append(r)
+                dists[u].append(d)
+                for w in adj[u]:
+                    if dist[w] < 0:
+                        dist[w] = d + 1
+                        visitados.append(w)
+                        fila.append(w)
+
+            for u in visitados:
+                dist[u] = -1
+            for h in hubs[r]:
+                tmp[h] = _INF
+
+        self.hubs = hubs
+        self.dists = dists
+        self.tempo_construcao = time.perf_counter() - inicio
+
+    def _distancia_por_posicao(self, i, j):
+        hi, di = self.hubs[i], self.dists[i]
+        hj, dj = self.hubs[j], self.dists[j]
+        a = b = 0
+        melhor = math.inf
+        while a < len(hi) and b < len(hj):
+            if hi[a] == hj[b]:
+                if di[a] + dj[b] < melhor:
+                    melhor = di[a] + dj[b]
+                a += 1
+                b += 1
+            elif hi[a] < hj[b]:
+                a += 1
+            else:
+                b += 1
+        return melhor
+
+    def distancia(self, u, v):
+        """Distância exata entre u e v (``math.inf`` se não houver caminho)."""
+        return self._distancia_por_posicao(self.posicao[u], self.posicao[v])
+
+    def _indice_invertido(self):
+        """
+        Rótulos agrupados por hub: (ponteiros, vértices, distâncias) em arrays, com os
+        vértices que têm o hub h em vertices[ponteiros[h]:ponteiros[h + 1]]. Construído
+        uma vez, na primeira varredura, e não vai para o disco.
+        """
+        if getattr(self, "_invertido", None) is None:
+            n = len(self.ordem)
+            tamanhos = np.fromiter((len(h) for h in self.hubs), dtype=np.int64, count=n)
+            vertices = np.repeat(np.arange(n, dtype=np.int32), tamanhos)
+            hubs = np.concatenate([np.frombuffer(h, dtype=np.int32) for h in self.hubs] or [np.empty(0, np.int32)])
+            dists = np.concatenate([np.frombuffer(d, dtype=np.int32) for d in self.dists] or [np.empty(0, np.int32)])
+            ordem = np.argsort(hubs, kind="stable")
+            ponteiros = np.searchsorted(hubs[ordem], np.arange(n + 1))
+            self._invertido = (ponteiros, vertices[ordem], dists[ordem].astype(np.int64))
+        return self._invertido
+
+    def _varredura(self, v):
+        """Distâncias de v a todos os vértices (por posição; _INF se inalcançável)."""
+        ponteiros, vertices, dists = self._indice_invertido()
+        i = self.posicao[v]
+        melhor = np.full(len(self.ordem), _INF, dtype=np.int64)
+        # Só os hubs do rótulo de v importam; cada vértice aparece uma vez por hub
+        for h, dh in zip(self.hubs[i], self.dists[i]):
+            a, b = ponteiros[h], ponteiros[h + 1]
+            alvo = vertices[a:b]
+            melhor[alvo] = np.minimum(melhor[alvo], dists[a:b] + dh)
+        return melhor
+
+    def distancias_a_partir_de(self, v):
+        """Gera (u, distância) para todos os vértices u alcançáveis a partir de v."""
+        melhor = self._varredura(v)
+        for j in np.flatnonzero(melhor < _INF).tolist():
+            yield self.ordem[j], int(melhor[j])
+
+    def resumo_a_partir_de(self, v):
+        """(alcançáveis, soma das distâncias) a partir de v, como ``resumo_distancias``."""
+        melhor = self._varredura(v)
+        alcancaveis = melhor < _INF
+        return int(alcancaveis.sum()), int(melhor[alcancaveis].sum())
+
+    def limites(self, u, v):
+        """Mesma interface de ``IndiceMarcos.limites``: aqui os dois limites são exatos."""
+        d = self.distancia(u, v)
+        return d, d
+
+    def caminho(self, u, v, graph):
+        """Reconstrói um caminho mínimo andando sempre para o vizinho um passo mais perto de v."""
+        d = self.distancia(u, v)
+        if d == math.inf:
+            return None
+        caminho = [u]
+        atual = u
+        while d > 0:
+            for w in graph[atual]:
+                if self.distancia(w, v) == d - 1:
+                    atual = w
+                    break
+            caminho.append(atual)
+            d -= 1
+        return caminho
+
+    def num_entradas(self):
+        """Número total de pares (hub, distância) em todos os rótulos."""
+        return sum(len(h) for h in self.hubs)
+
+    def uso_memoria(self):
+        """Bytes ocupados pelos rótulos e pela tabela de posições."""
+        total = sys.getsizeof(self.hubs) + sys.getsizeof(self.dists)
+        total += sum(sys.getsizeof(h) for h in self.hubs)
+        total += sum(sys.getsizeof(d) for d in self.dists)
+        total += sys.getsizeof(self.ordem) + sys.getsizeof(self.posicao)
+        return total
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado.pop("_invertido", None)
+        return estado
+
+    def salvar(self, caminho_grafo):
+        """Salva o índice ao lado do snapshot do grafo (extensão ``.pll``)."""
+        salvar_objeto(self, caminho_ao_lado(caminho_grafo, "pll"))
+
+    @staticmethod
+    def carregar(caminho_grafo, graph=None):
+        """
+        Carrega o índice salvo ao lado do snapshot. Se ``graph`` for dado, confere
+        que o índice foi construído sobre o mesmo conteúdo.
+        """
+        indice = carregar_objeto(caminho_ao_lado(caminho_grafo, "pll"))
+        if graph is not None and impressao_digital(graph) != indice.impressao:
+            raise ValueError("O índice PLL não corresponde ao grafo informado.")
+        return indice
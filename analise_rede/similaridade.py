@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from .csr import como_csr
+from .persistencia import caminho_ao_lado, carregar_objeto, impressao_digital, salvar_objeto
+
+# Primo de Mersenne 2^31 - 1: (a * x + b) cabe em int64 para a, x < 2^31
+_PRIMO = (1 << 31) - 1
+# Entradas (vizinho x permutação) processadas por bloco ao calcular as assinaturas
+_ENTRADAS_POR_BLOCO = 1 << 21
+
+
+def jaccard(graph, u, v):
+    """Similaridade de Jaccard exata entre os conjuntos de vizinhos de ``u`` e ``v``."""
+    a, b = set(graph[u]), set(graph[v])
+    uniao = len(a | b)
+    return len(a & b) / uniao if uniao else 0.0
+
+
+def jaccard_ponderado(graph, u, v):
+    """Jaccard ponderado: soma dos mínimos sobre soma dos máximos dos pesos das arestas."""
+    a, b = graph[u], graph[v]
+    chaves = set(a) | set(b)
+    maximos = sum(max(a.get(w, 0), b.get(w, 0)) for w in chaves)
+    if maximos == 0:
+        return 0.0
+    return sum(min(a.get(w, 0), b.get(w, 0)) for w in chaves) / maximos
+
+
+class IndiceMinHash:
+    """
+    Índice MinHash/LSH para consultas de "colaboradores parecidos".
+
+    A assinatura de cada vértice guarda, para cada uma de ``num_permutacoes`` funções
+    de hash, o menor hash entre os seus vizinhos; a fração de posições iguais entre
+    duas assinaturas estima a similaridade de Jaccard dos conjuntos de vizinhos. As
+    assinaturas são divididas em ``bandas``; vértices com alguma banda idêntica caem
+    no mesmo balde e viram candidatos, de modo que uma consulta só compara o vértice
+    com uma pequena parte do grafo. Com r = num_permutacoes / bandas linhas por banda,
+    pares com Jaccard acima de aproximadamente (1 / bandas) ** (1 / r) são encontrados
+    com alta probabilidade.
+    """
+
+    def __init__(self, graph, num_permutacoes=128, bandas=32, seed=42):
+        if num_permutacoes % bandas != 0:
+            raise ValueError("O número de permutações deve ser múltiplo do número de bandas.")
+        csr = como_csr(graph)
+        self.vertices = csr.vertices
+        self.indice = dict(csr.indice)
+        self.impressao = impressao_digital(graph)
+        self.num_permutacoes = num_permutacoes
+        self.bandas = bandas
+        self.assinaturas = self._assinar(csr, num_permutacoes, seed)
+
+        # Vértices sem vizinhos não têm assinatura útil e ficam fora dos baldes
+        self._com_vizinhos = np.diff(csr.indptr) > 0
+        self._baldes = []
+        for chaves in self._chaves_das_bandas(self.assinaturas):
+            membros = np.flatnonzero(self._com_vizinhos)
+            ordem = membros[np.argsort(chaves[membros], kind="stable")]
+            self._baldes.append((chaves[ordem], ordem.astype(np.int32)))
+
+    @staticmethod
+    def _assinar(csr, num_permutacoes, seed):
+        rng = np.random.default_rng(seed)
+        a = rng.integers(1, _PRIMO, size=num_permutacoes, dtype=np.int64)
+        b = rng.integers(0, _PRIMO, size=num_permutacoes, dtype=np.int64)
+
+        n = len(csr)
+        indptr = np.asarray(csr.indptr)
+        indices = np.asarray(csr.indices).astype(np.int64)
+        graus = np.diff(indptr)
+        assinaturas = np.full((n, num_permutacoes), _PRIMO, dtype=np.uint32)
+
+        passo = max(_ENTRADAS_POR_BLOCO // num_permutacoes, 1)
+        cortes = np.minimum(np.searchsorted(indptr, np.arange(passo, indptr[-1], passo)), n)
+        limites = np.unique(np.concatenate(([0], cortes, [n]))).tolist()
+        for inicio, fim in zip(limites[:-1], limites[1:]):
+            linhas = np.flatnonzero(graus[inicio:fim] > 0) + inicio
+            if len(linhas) == 0:
+                continue
+            vizinhos = indices[indptr[inicio]:indptr[fim]]
+            hashes = (vizinhos[:, None] * a + b) % _PRIMO
+            assinaturas[linhas] = np.minimum.reduceat(hashes, indptr[linhas] - indptr[inicio], axis=0)
+        return assinaturas
+
+    def _chaves_das_bandas(self, assinaturas):
+        """Uma chave uint64 por vértice e banda, combinando as linhas da banda."""
+        linhas = self.num_permutacoes // self.bandas
+        for banda in range(self.bandas):
+            bloco = assinaturas[:, banda * linhas:(banda + 1) * linhas].astype(np.uint64)
+            chave = np.full(len(assinaturas), 0xCBF29CE484222325, dtype=np.uint64)
+            for j in range(linhas):
+                chave = (chave ^ bloco[:, j]) * np.uint64(0x100000001B3)
+            yield chave
+
+    def candidatos(self, v):
+        """Índices dos vértices que compartilham ao menos um balde com ``v``."""
+        i = self._posicao(v)
+        if not self._com_vizinhos[i]:
+            return np.empty(0, dtype=np.int32)
+        partes = []
+        for banda, chave in enumerate(self._chaves_das_bandas(self.assinaturas[i:i + 1])):
+            chaves, membros = self._baldes[banda]
+            inicio = np.searchsorted(chaves, chave[0], side="left")
+            fim = np.searchsorted(chaves, chave[0], side="right")
+            partes.append(membros[inicio:fim])
+        encontrados = np.unique(np.concatenate(partes))
+        return encontrados[encontrados != i]
+
+    def similaridade_estimada(self, u, v):
+        """Jaccard estimado pela fração de posições iguais das assinaturas."""
+        return float(np.mean(self.assinaturas[self._posicao(u)] == self.assinaturas[self._posicao(v)]))
+
+    def similares(self, v, k=10, graph=None, criterio="estimado"):
+        """
+        Os ``k`` vértices mais parecidos com ``v`` entre os candidatos do LSH, como
+        lista de (vértice, similaridade). ``criterio`` define a ordenação final:
+        'estimado' (MinHash), 'jaccard' (exato) ou 'ponderado' (Jaccard ponderado
+        pelos pesos das arestas); os dois últimos exigem o ``graph`` indexado.
+        """
+        if criterio not in ("estimado", "jaccard", "ponderado"):
+            raise ValueError(f"Critério desconhecido: {criterio}.")
+        if criterio != "estimado" and graph is None:
+            raise ValueError("A reordenação exata exige o grafo indexado.")
+
+        candidatos = self.candidatos(v)
+        i = self._posicao(v)
+        if criterio == "estimado":
+            valores = (self.assinaturas[candidatos] == self.assinaturas[i]).mean(axis=1).tolist()
+        else:
+            medida = jaccard if criterio == "jaccard" else jaccard_ponderado
+            valores = [medida(graph, v, self.vertices[j]) for j in candidatos.tolist()]
+
+        pares = [(self.vertices[j], s) for j, s in zip(candidatos.tolist(), valores)]
+        pares.sort(key=lambda par: (-par[1], str(par[0])))
+        return pares[:k]
+
+    def _posicao(self, v):
+        i = self.indice.get(v)
+        if i is None:
+            raise ValueError(f"Vértice {v} não existe no índice.")
+        return i
+
+    def salvar(self, caminho_grafo):
+        """Salva o índice ao lado do snapshot do grafo (extensão ``.minhash``)."""
+        salvar_objeto(self, caminho_ao_lado(caminho_grafo, "minhash"))
+
+    @staticmethod
+    def carregar(caminho_grafo, graph=None):
+        """
+        Carrega o índice salvo ao lado do snapshot. Se ``graph`` for dado, confere
+        que o índice foi construído sobre o mesmo conteúdo.
+        """
+        indice = carregar_objeto(caminho_ao_lado(caminho_grafo, "minhash"))
+        if graph is not None and impressao_digital(graph) != indice.impressao:
+            raise ValueError("O índice MinHash não corresponde ao grafo informado.")
+        return indice
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+
+from .grafo import Grafo
+from .processador_dados import _adicionar_obra, limpar_string
+
+
+class EvolucaoTemporal:
+    """
+    Constrói os grafos de ``processar_arquivo`` ano a ano, de forma incremental.
+
+    As obras de cada ano são acrescentadas aos mesmos ``grafo_dir``/``grafo_und``;
+    componentes conexas do grafo não-direcionado (union-find), graus dos atores e
+    graus de entrada dos diretores são atualizados durante a inserção. Cada ano gera
+    um instantâneo leve em ``instantaneos``: totais acumulados e apenas os graus que
+    mudaram naquele ano. A série inteira custa uma única construção.
+    """
+
+    def __init__(self):
+        self.grafo_dir = Grafo()
+        self.grafo_und = Grafo()
+        self.num_obras = 0
+        self.instantaneos = []
+        # union-find sobre os vértices do grafo não-direcionado
+        self._pai = {}
+        self._tamanho = {}
+        self.num_componentes = 0
+        self.maior_componente = 0
+        self.grau_entrada_diretores = {}
+
+    def _encontrar(self, x):
+        pai = self._pai
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    def _unir(self, a, b):
+        ra, rb = self._encontrar(a), self._encontrar(b)
+        if ra == rb:
+            return
+        if self._tamanho[ra] < self._tamanho[rb]:
+            ra, rb = rb, ra
+        self._pai[rb] = ra
+        self._tamanho[ra] += self._tamanho[rb]
+        self.num_componentes -= 1
+        self.maior_componente = max(self.maior_componente, self._tamanho[ra])
+
+    def _registrar_vertice(self, x):
+        if x not in self._pai:
+            self._pai[x] = x
+            self._tamanho[x] = 1
+            self.num_componentes += 1
+            self.maior_componente = max(self.maior_componente, 1)
+
+    def adicionar_ano(self, ano, obras, ao_fim_do_ano=None):
+        """
+        Acrescenta as obras (pares (diretores, elenco), nomes já normalizados) de ``ano``
+        e registra o instantâneo. ``ao_fim_do_ano(ano, grafo_dir, grafo_und)``, se
+        informado, é chamado com os grafos acumulados e seu retorno fica em
+        ``instantaneo['metricas']`` (ex.: centralidades dos diretores naquele ano).
+        """
+        if self.instantaneos and ano <= self.instantaneos[-1]['ano']:
+            raise ValueError(f"Os anos devem ser acrescentados em ordem crescente ({ano} após {self.instantaneos[-1]['ano']}).")
+
+        vertices_antes = self.grafo_und.obter_numero_vertices()
+        atores_tocados = set()
+        diretores_tocados = set()
+        for diretores, elenco in obras:
+            # Arestas ator -> diretor ainda inexistentes aumentam o grau de entrada do diretor
+            novas = {(a, d) for a in elenco for d in diretores if d not in self.grafo_dir.obter_vizinhos(a)}
+            for _, diretor in novas:
+                self.grau_entrada_diretores[diretor] = self.grau_entrada_diretores.get(diretor, 0) + 1
+                diretores_tocados.add(diretor)
+
+            _adicionar_obra(diretores, elenco, self.grafo_dir, self.grafo_und)
+
+            # O grafo não-direcionado só ganha vértices com elencos de 2 ou mais pessoas
+            if len(elenco) >= 2:
+                for ator in elenco:
+                    self._registrar_vertice(ator)
+                for a, b in zip(elenco, elenco[1:]):
+                    self._unir(a, b)
+                atores_tocados.update(elenco)
+        self.num_obras += len(obras)
+
+        instantaneo = {
+            'ano': ano,
+            'obras_no_ano': len(obras),
+            'obras': self.num_obras,
+            'vertices_und': self.grafo_und.obter_numero_vertices(),
+            'arestas_und': self.grafo_und.obter_numero_arestas(),
+            'vertices_dir': self.grafo_dir.obter_numero_vertices(),
+            'arestas_dir': self.grafo_dir.obter_numero_arestas(),
+            'novos_atores': self.grafo_und.obter_numero_vertices() - vertices_antes,
+            'componentes': self.num_componentes,
+            'maior_componente': self.maior_componente,
+            'graus_alterados': {v: len(self.grafo_und.obter_vizinhos(v)) for v in atores_tocados},
+            'graus_entrada_alterados': {d: self.grau_entrada_diretores[d] for d in diretores_tocados},
+        }
+        if ao_fim_do_ano is not None:
+            instantaneo['metricas'] = ao_fim_do_ano(ano, self.grafo_dir, self.grafo_und)
+        self.instantaneos.append(instantaneo)
+        return instantaneo
+
+    def tabela_no_ano(self, ano, chave='graus_alterados'):
+        """
+        Reconstrói a tabela completa de graus (ou, com ``chave='graus_entrada_alterados'``,
+        de graus de entrada dos diretores) ao final de ``ano``, aplicando os deltas anuais.
+        """
+        tabela = {}
+        for instantaneo in self.instantaneos:
+            if instantaneo['ano'] > ano:
+                break
+            tabela.update(instantaneo[chave])
+        return tabela
+
+    def resumo(self):
+        """DataFrame com uma linha por ano e as métricas escalares dos instantâneos."""
+        colunas = ['ano', 'obras_no_ano', 'obras', 'vertices_und', 'arestas_und', 'vertices_dir',
+                   'arestas_dir', 'novos_atores', 'componentes', 'maior_componente']
+        return pd.DataFrame([{c: inst[c] for c in colunas} for inst in self.instantaneos])
+
+
+def evolucao_por_ano(caminho_arquivo: str, ao_fim_do_ano=None, coluna_ano='release_year'):
+    """
+    Lê o CSV de títulos, ordena as obras pelo ano de lançamento e constrói a
+    ``EvolucaoTemporal`` com um instantâneo por ano. Obras sem diretor, elenco ou
+    ano são descartadas, como em ``processar_arquivo``.
+    """
+    print("Iniciando o processamento temporal do arquivo CSV...")
+    df = pd.read_csv(caminho_arquivo, usecols=['director', 'cast', coluna_ano])
+    df.dropna(subset=['director', 'cast'], inplace=True)
+    sem_ano = int(df[coluna_ano].isna().sum())
+    if sem_ano:
+        print(f"{sem_ano} obras sem ano de lançamento foram ignoradas.")
+        df = df.dropna(subset=[coluna_ano])
+    # Ordenação estável: dentro de um ano, a ordem do arquivo é mantida
+    df = df.sort_values(coluna_ano, kind='stable')
+
+    evolucao = EvolucaoTemporal()
+    for ano, grupo in df.groupby(coluna_ano, sort=True):
+        obras = [
+            ([limpar_string(d) for d in diretores.split(',')], [limpar_string(a) for a in elenco.split(',')])
+            for diretores, elenco in zip(grupo['director'], grupo['cast'])
+        ]
+        evolucao.adicionar_ano(int(ano), obras, ao_fim_do_ano)
+
+    print("Processamento temporal finalizado.")
+    return evolucao
@@ -0,0 +1,206 @@
+# arquivo: avaliar_aproximacoes.py
+
+# --- Precisão x custo das centralidades de intermediação aproximadas ---
+#
+# Compara as funções aproximadas de ``algoritmos`` com a betweenness exata
+# (``intermediacao_exata_comprimida``) em grafos ator-ator sintéticos de tamanho
+# crescente, variando k e a semente. Para cada execução registra correlação de
+# postos (Spearman), sobreposição do top 10, erro relativo e tempo de relógio.
+#
+# Uso: python avaliar_aproximacoes.py [saida.csv]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from analise_rede.algoritmos import (
+    approx_betweenness_centrality,
+    approx_betweenness_centrality_all,
+    betweenness_centrality,
+    calcular_centralidades_de_intermediacao_aprox,
+)
+from analise_rede.gemeos import intermediacao_exata_comprimida
+from analise_rede.grafo import Grafo
+from analise_rede.processador_dados import processar_arquivo
+
+TAMANHOS = [250, 500, 1000, 2000]   # número de obras do catálogo sintético
+VALORES_K = [10, 25, 50, 100, 200]
+SEMENTES = [1, 2, 3]
+# As funções que calculam um vértice por vez são avaliadas numa amostra de vértices
+VERTICES_AVALIADOS = 40
+TOP_N = 10
+
+
+def gerar_catalogo(num_obras, semente):
+    """Catálogo sintético no formato do CSV real, com popularidade desigual entre atores."""
+    rng = random.Random(semente)
+    atores = [f"Ator {i}" for i in range(3 * num_obras)]
+    diretores = [f"Diretor {i}" for i in range(num_obras // 3 + 1)]
+    linhas = []
+    for i in range(num_obras):
+        # metade dos elencos vem de um núcleo pequeno de atores populares
+        grupo = atores[:max(10, int(len(atores) ** rng.random()))] if rng.random() < 0.5 else atores
+        elenco = rng.sample(grupo, rng.randint(1, 8))
+        direcao = rng.sample(diretores, rng.choice([1, 1, 1, 2]))
+        linhas.append({"title": f"Obra {i}", "director": ", ".join(direcao), "cast": ", ".join(elenco)})
+    return pd.DataFrame(linhas)
+
+
+def construir_grafo(num_obras, semente):
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "catalogo.csv")
+        gerar_catalogo(num_obras, semente).to_csv(caminho, index=False)
+        grafo_dir, grafo_und = Grafo(), Grafo()
+        processar_arquivo(caminho, grafo_dir, grafo_und)
+    return grafo_und
+
+
+def correlacao_spearman(a, b):
+    """Correlação de Spearman (postos médios em empates); nan se um dos lados for constante."""
+    postos_a = pd.Series(a).rank().to_numpy()
+    postos_b = pd.Series(b).rank().to_numpy()
+    if postos_a.std() == 0 or postos_b.std() == 0:
+        return float("nan")
+    return float(np.corrcoef(postos_a, postos_b)[0, 1])
+
+
+def sobreposicao_top(aprox, exato, vertices, n=TOP_N):
+    """Fração do top-n exato (entre ``vertices``) que aparece no top-n aproximado."""
+    n = min(n, len(vertices))
+    topo = lambda valores: set(sorted(vertices, key=lambda v: (-valores[v], v))[:n])
+    return len(topo(aprox) & topo(exato)) / n
+
+
+def erro_relativo(aprox, exato, vertices):
+    """Erro absoluto total dividido pela soma dos valores exatos."""
+    total = sum(exato[v] for v in vertices)
+    if total == 0:
+        return float("nan")
+    return sum(abs(aprox[v] - exato[v]) for v in vertices) / total
+
+
+def metricas(nome, aprox, exato, avaliados, tempo, num_vertices, **extras):
+    # Tempo estimado para todos os vértices (só difere nas funções avaliadas por amostra)
+    return {
+        "funcao": nome,
+        **extras,
+        "avaliados": len(avaliados),
+        "spearman": correlacao_spearman([aprox[v] for v in avaliados], [exato[v] for v in avaliados]),
+        f"top{TOP_N}": sobreposicao_top(aprox, exato, avaliados),
+        "erro_relativo": erro_relativo(aprox, exato, avaliados),
+        "tempo_s": tempo * num_vertices / len(avaliados),
+    }
+
+
+def avaliar_tamanho(num_obras):
+    """Executa todas as combinações de função, k e semente para um catálogo."""
+    grafo = construir_grafo(num_obras, semente=0)
+    csr = grafo.obter_csr()
+    N = len(csr)
+    print(f"\nCatálogo com {num_obras} obras: {N} vértices, {grafo.obter_numero_arestas()} arestas")
+
+    inicio = time.perf_counter()
+    exato = intermediacao_exata_comprimida(grafo.lista_adj)
+    tempo_exato = time.perf_counter() - inicio
+    print(f"  betweenness exata: {tempo_exato:.2f}s")
+
+    todos = list(csr.vertices)
+    # Amostra para as funções por vértice: o top 10 exato mais vértices aleatórios
+    rng = random.Random(0)
+    topo_exato = sorted(todos, key=lambda v: (-exato[v], v))[:TOP_N]
+    restantes = [v for v in todos if v not in set(topo_exato)]
+    amostra = topo_exato + rng.sample(restantes, min(VERTICES_AVALIADOS - TOP_N, len(restantes)))
+
+    linhas = [{"funcao": "exata (comprimida)", "obras": num_obras, "vertices": N, "k": N, "semente": None,
+               "avaliados": N, "spearman": 1.0, f"top{TOP_N}": 1.0, "erro_relativo": 0.0,
+               "tempo_s": tempo_exato}]
+    base = {"obras": num_obras, "vertices": N}
+
+    for k in VALORES_K:
+        for semente in SEMENTES:
+            inicio = time.perf_counter()
+            aprox = approx_betweenness_centrality_all(csr, k=k, seed=semente)
+            linhas.append(metricas("approx_betweenness_centrality_all", aprox, exato, todos,
+                                   time.perf_counter() - inicio, N, k=k, semente=semente, **base))
+
+            inicio = time.perf_counter()
+            aprox = calcular_centralidades_de_intermediacao_aprox(grafo, k=k, semente=semente)
+            linhas.append(metricas("calcular_centralidades_de_intermediacao_aprox", aprox, exato, todos,
+                                   time.perf_counter() - inicio, N, k=k, semente=semente, **base))
+
+            inicio = time.perf_counter()
+            aprox = {v: approx_betweenness_centrality(csr, v, k=k, seed=semente) for v in amostra}
+            linhas.append(metricas("approx_betweenness_centrality", aprox, exato, amostra,
+                                   time.perf_counter() - inicio, N, k=k, semente=semente, **base))
+
+    # Sem parâmetros de amostragem: usa sempre os primeiros 100 vértices como fontes. A função
+    # soma as dependências de todos os vértices, não as de v, e devolve quase o mesmo valor para
+    # qualquer v; ela é comparada com a referência exata sem ajustes e marcada como quebrada.
+    inicio = time.perf_counter()
+    aprox = {v: betweenness_centrality(csr, v) for v in amostra}
+    linhas.append(metricas("betweenness_centrality (quebrada)", aprox, exato, amostra,
+                           time.perf_counter() - inicio, N, k=min(100, N), semente=None, **base))
+    valores = list(aprox.values())
+    print(f"  AVISO: betweenness_centrality está quebrada (ignora o vértice consultado): "
+          f"valores entre {min(valores):.6f} e {max(valores):.6f} para {len(valores)} vértices, "
+          f"Spearman {linhas[-1]['spearman']:.2f}")
+    return linhas
+
+
+def resumir(resultados):
+    """Média e desvio padrão entre sementes, por função, tamanho e k."""
+    colunas = ["spearman", f"top{TOP_N}", "erro_relativo", "tempo_s"]
+    return resultados.groupby(["funcao", "obras", "vertices", "k"], dropna=False)[colunas].agg(["mean", "std"])
+
+
+def plotar_curvas(resultados, caminho):
+    """Spearman e erro relativo em função do tempo, uma curva por função e tamanho."""
+    medias = resultados.groupby(["funcao", "obras", "k"])[["spearman", "erro_relativo", "tempo_s"]].mean().reset_index()
+    fig, eixos = plt.subplots(1, 2, figsize=(14, 6))
+    for (funcao, obras), grupo in medias.groupby(["funcao", "obras"]):
+        if funcao.startswith("exata"):
+            continue
+        grupo = grupo.sort_values("tempo_s")
+        rotulo = f"{funcao} ({obras} obras)"
+        eixos[0].plot(grupo["tempo_s"], grupo["spearman"], marker="o", label=rotulo)
+        eixos[1].plot(grupo["tempo_s"], grupo["erro_relativo"], marker="o", label=rotulo)
+    for eixo, titulo in zip(eixos, ["Correlação de Spearman", "Erro relativo"]):
+        eixo.set_xscale("log")
+        eixo.set_xlabel("Tempo (s, estimado para todos os vértices)")
+        eixo.set_title(titulo)
+        eixo.grid(True, alpha=0.3)
+    eixos[1].legend(fontsize=7)
+    plt.tight_layout()
+    plt.savefig(caminho, dpi=120)
+    plt.close(fig)
+
+
+def main():
+    caminho_saida = sys.argv[1] if len(sys.argv) > 1 else "avaliacao_aproximacoes.csv"
+
+    print("=" * 70)
+    print("PRECISÃO x CUSTO DAS INTERMEDIAÇÕES APROXIMADAS")
+    print("=" * 70)
+
+    linhas = []
+    for num_obras in TAMANHOS:
+        linhas.extend(avaliar_tamanho(num_obras))
+    resultados = pd.DataFrame(linhas)
+    resultados.to_csv(caminho_saida, index=False)
+
+    with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", 200):
+        print(resumir(resultados).round(4))
+
+    caminho_grafico = os.path.splitext(caminho_saida)[0] + ".png"
+    plotar_curvas(resultados, caminho_grafico)
+    print(f"\nResultados salvos em '{caminho_saida}' e '{caminho_grafico}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -72,7 +72,7 @@ def analisar_distribuicao_componentes():
     processar_arquivo(caminho_csv, grafo_dir, grafo_und)
 
     # Análise do Grafo Não-Direcionado
-    num_cc, tamanhos_cc = count_connected_components(grafo_und.lista_adj)
+    num_cc, tamanhos_cc = count_connected_components(grafo_und.obter_csr())
     print(f"\nGrafo Não-Direcionado (Atores):")
     print(f"  - Número total de Componentes Conexas: {num_cc}")
     if tamanhos_cc:
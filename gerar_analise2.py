@@ -9,6 +9,7 @@ from analise_rede.algoritmos import (
     top_betweenness_directors,
     top_closeness_directors,
 )
+from analise_rede.intermediacao import SessaoIntermediacao
 
 
 def analisar_top_diretores_centralidade():
@@ -37,7 +38,7 @@ def analisar_top_diretores_centralidade():
     print("Calculando top 10 diretores por Betweenness...")
     print("(Diretores que mais controlam o fluxo de informações na rede)")
     
-    top_btw = top_betweenness_directors(grafo_dir.lista_adj, diretores, top_n=10, sample=100, seed=42, plot=True)
+    top_btw = top_betweenness_directors(grafo_dir.obter_csr(), diretores, top_n=10, sample=100, seed=42, plot=True)
     
     print("\nTop 10 Diretores por Betweenness Centrality:")
     print("-" * 60)
@@ -54,7 +55,7 @@ def analisar_top_diretores_centralidade():
     print("Calculando top 10 diretores por Closeness...")
     print("(Diretores que estão mais próximos de todos os outros na rede)")
     
-    top_clo = top_closeness_directors(grafo_dir.lista_adj, diretores, top_n=10, plot=True)
+    top_clo = top_closeness_directors(grafo_dir.obter_csr(), diretores, top_n=10, plot=True)
     
     print("\nTop 10 Diretores por Closeness Centrality:")
     print("-" * 60)
@@ -95,16 +96,21 @@ def analisar_top_diretores_centralidade():
     print("="*70)
 
 
-def analisar_diretor_especifico(nome_diretor):
-    """Análise detalhada de um diretor específico."""
+def analisar_diretor_especifico(nome_diretor, grafo_dir=None, sessao=None):
+    """
+    Análise detalhada de um diretor específico. Para analisar vários diretores,
+    construa o grafo e a ``SessaoIntermediacao`` uma vez e passe-os em cada chamada:
+    a sessão processa as fontes amostradas só na criação e as consultas são leituras.
+    """
     caminho_csv = 'dados/netflix_amazon_disney_titles.csv'
     
     print(f"\nAnálise detalhada do diretor: {nome_diretor}")
     print("-" * 50)
     
-    grafo_dir = Grafo()
-    grafo_und = Grafo()
-    processar_arquivo(caminho_csv, grafo_dir, grafo_und)
+    if grafo_dir is None:
+        grafo_dir = Grafo()
+        grafo_und = Grafo()
+        processar_arquivo(caminho_csv, grafo_dir, grafo_und)
     
     if nome_diretor not in grafo_dir.lista_adj:
         print(f"Diretor '{nome_diretor}' não encontrado no dataset.")
@@ -114,7 +120,6 @@ def analisar_diretor_especifico(nome_diretor):
     from analise_rede.algoritmos import (
         degree_centrality,
         closeness_centrality,
-        approx_betweenness_centrality,
         in_degree_centrality
     )
     
@@ -123,10 +128,12 @@ def analisar_diretor_especifico(nome_diretor):
     in_deg = in_degree_centrality(grafo_dir.lista_adj, nome_diretor)
     
     # Closeness centrality
-    clo = closeness_centrality(grafo_dir.lista_adj, nome_diretor)
+    clo = closeness_centrality(grafo_dir.obter_csr(), nome_diretor)
     
-    # Betweenness centrality
-    btw = approx_betweenness_centrality(grafo_dir.lista_adj, nome_diretor, k=100)
+    # Betweenness centrality (as 100 fontes amostradas ficam em cache entre execuções)
+    if sessao is None:
+        sessao = SessaoIntermediacao(grafo_dir.obter_csr(), k=100, diretorio_cache='cache')
+    btw = sessao.intermediacao(nome_diretor)
     
     print(f"Degree Centrality (Total): {deg:.6f}")
     print(f"In-Degree Centrality: {in_deg:.6f}")
@@ -142,5 +149,9 @@ if __name__ == "__main__":
     # Executar análise completa
     analisar_top_diretores_centralidade()
     
-    # Exemplo de análise de diretor específico (descomente para usar)
-    # analisar_diretor_especifico("Christopher Nolan")
+    # Exemplo de análise de diretores específicos (descomente para usar)
+    # grafo_dir, grafo_und = Grafo(), Grafo()
+    # processar_arquivo('dados/netflix_amazon_disney_titles.csv', grafo_dir, grafo_und)
+    # sessao = SessaoIntermediacao(grafo_dir.obter_csr(), k=100, diretorio_cache='cache')
+    # for nome in ("CHRISTOPHER NOLAN", "MARTIN SCORSESE"):
+    #     analisar_diretor_especifico(nome, grafo_dir, sessao)
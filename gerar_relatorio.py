@@ -0,0 +1,212 @@
+# arquivo: gerar_relatorio.py
+
+# --- Relatório completo com uma única construção dos grafos ---
+#
+# Reúne as atividades de main.py e gerar_analise*.py (componentes, distribuições
+# de grau, top 10 por grau, betweenness e closeness de atores e diretores, MST) como
+# tarefas com dependências. Os grafos são construídos uma vez e as tarefas
+# independentes rodam em paralelo; tabelas, gráficos e o texto do relatório
+# são gravados em arquivos no diretório de saída.
+#
+# Uso: python gerar_relatorio.py [caminho_csv] [diretorio_saida] [num_threads]
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from analise_rede.agendador import Tarefa, caminho_critico, executar_tarefas
+from analise_rede.algoritmos import (
+    calcular_centralidades_de_intermediacao_aprox,
+    calcular_centralidades_de_proximidade_em_lote,
+    count_connected_components,
+    count_strongly_connected_components,
+    prim_mst_for_vertex,
+    top_betweenness_directors,
+    top_closeness_directors,
+)
+from analise_rede.grafo import Grafo
+from analise_rede.processador_dados import processar_arquivo
+
+TOP_N = 10
+# O matplotlib não é thread-safe: os gráficos são desenhados um de cada vez
+_TRAVA_GRAFICOS = threading.Lock()
+
+
+def construir_grafos(caminho_csv):
+    grafo_dir = Grafo()
+    grafo_und = Grafo()
+    processar_arquivo(caminho_csv, grafo_dir, grafo_und)
+    # Snapshots congelados: as tarefas só leem, e várias rodam ao mesmo tempo
+    return {
+        'dir': grafo_dir,
+        'und': grafo_und,
+        'csr_dir': grafo_dir.congelar(),
+        'csr_und': grafo_und.congelar(),
+        'diretores': {v for nbrs in grafo_dir.lista_adj.values() for v in nbrs},
+    }
+
+
+def _salvar_histogramas(caminho, series):
+    """Histogramas lado a lado (escala log no eixo y). Usa Figure diretamente, sem o estado global do pyplot."""
+    with _TRAVA_GRAFICOS:
+        fig = Figure(figsize=(8 * len(series), 7))
+        for i, (valores, titulo, rotulo_x, cor) in enumerate(series, 1):
+            eixo = fig.add_subplot(1, len(series), i)
+            eixo.hist(valores, bins=50, color=cor, alpha=0.8)
+            eixo.set_title(titulo)
+            eixo.set_xlabel(rotulo_x)
+            eixo.set_ylabel('Frequência')
+            eixo.set_yscale('log')
+            eixo.grid(axis='y', linestyle='--', alpha=0.7)
+        fig.tight_layout()
+        fig.savefig(caminho)
+
+
+def _tabela(titulo, pares, rotulo, caminho_csv):
+    pd.DataFrame(pares, columns=['vertice', rotulo]).to_csv(caminho_csv, index=False)
+    linhas = [titulo, '-' * 65]
+    for i, (vertice, valor) in enumerate(pares, 1):
+        linhas.append(f"{i:<5} {vertice:<45} {valor:.6f}")
+    return '\n'.join(linhas)
+
+
+def criar_tarefas(caminho_csv, saida, max_workers):
+    arquivo = lambda nome: os.path.join(saida, nome)
+
+    def resumo(g):
+        return '\n'.join([
+            'RESULTADOS DA CONSTRUÇÃO DOS GRAFOS',
+            f"Grafo Dir (V, E): {g['dir'].obter_numero_vertices()}, {g['dir'].obter_numero_arestas()}",
+            f"Grafo Und (V, E): {g['und'].obter_numero_vertices()}, {g['und'].obter_numero_arestas()}",
+        ])
+
+    def componentes(g):
+        num_cc, tamanhos_cc = count_connected_components(g['csr_und'])
+        num_scc, tamanhos_scc = count_strongly_connected_components(g['dir'].lista_adj)
+        _salvar_histogramas(arquivo('distribuicao_componentes.png'), [
+            (tamanhos_cc, 'Distribuição de Tamanho - Componentes Conexas', 'Tamanho da Componente', 'coral'),
+            (tamanhos_scc, 'Distribuição de Tamanho - Comp. Fortemente Conexas', 'Tamanho da Componente', 'purple'),
+        ])
+        return '\n'.join([
+            'COMPONENTES',
+            f"Componentes conexas (atores): {num_cc}, maior: {max(tamanhos_cc, default=0)}",
+            f"Componentes fortemente conexas (atores-diretores): {num_scc}, maior: {max(tamanhos_scc, default=0)}",
+        ])
+
+    def graus(g):
+        # Mesmas normalizações de degree_centrality e in_degree_centrality, calculadas sobre os arrays CSR
+        csr_und, csr_dir = g['csr_und'], g['csr_dir']
+        n_und, n_dir = max(len(csr_und) - 1, 1), max(len(csr_dir) - 1, 1)
+        entrada = np.bincount(csr_dir.indices, minlength=len(csr_dir))
+        return {
+            'und': dict(zip(csr_und.vertices, (csr_und.graus() / n_und).tolist())),
+            'dir': dict(zip(csr_dir.vertices, ((csr_dir.graus() + entrada) / (2 * n_dir)).tolist())),
+            'entrada': dict(zip(csr_dir.vertices, (entrada / n_dir).tolist())),
+        }
+
+    def histograma_graus(tabelas):
+        _salvar_histogramas(arquivo('distribuicao_graus.png'), [
+            (list(tabelas['und'].values()), 'Distribuição de Grau - Atores (Não-Direcionado)', 'Centralidade de Grau', 'royalblue'),
+            (list(tabelas['dir'].values()), 'Distribuição de Grau - Atores/Diretores (Direcionado)', 'Centralidade de Grau', 'seagreen'),
+        ])
+        return "Distribuições de grau salvas em 'distribuicao_graus.png'."
+
+    def top_grau_atores(tabelas):
+        pares = sorted(tabelas['und'].items(), key=lambda item: item[1], reverse=True)[:TOP_N]
+        return _tabela('TOP 10 ATORES POR CENTRALIDADE DE GRAU', pares, 'grau', arquivo('top_grau_atores.csv'))
+
+    def top_grau_diretores(g, tabelas):
+        # Como em gerar_analise.py: diretores que não aparecem no grafo de atores
+        diretores = set(g['dir'].obter_vertices()) - set(g['und'].obter_vertices())
+        pares = [(d, tabelas['entrada'][d]) for d in diretores if tabelas['entrada'][d] > 0]
+        pares = sorted(pares, key=lambda item: item[1], reverse=True)[:TOP_N]
+        return _tabela('TOP 10 DIRETORES POR GRAU DE ENTRADA', pares, 'grau_entrada', arquivo('top_grau_diretores.csv'))
+
+    def intermediacao_atores(g):
+        # Como em gerar_analise3.py: betweenness aproximada com k=200 fontes
+        centralidades = calcular_centralidades_de_intermediacao_aprox(g['und'], k=200)
+        pares = sorted(centralidades.items(), key=lambda item: item[1], reverse=True)[:TOP_N]
+        return _tabela('TOP 10 ATORES POR BETWEENNESS', pares, 'betweenness', arquivo('top_betweenness_atores.csv'))
+
+    def proximidade_atores(g):
+        centralidades = calcular_centralidades_de_proximidade_em_lote(g['und'])
+        pares = sorted(centralidades.items(), key=lambda item: item[1], reverse=True)[:TOP_N]
+        return _tabela('TOP 10 ATORES POR CLOSENESS', pares, 'closeness', arquivo('top_closeness_atores.csv'))
+
+    def intermediacao_diretores(g):
+        pares = top_betweenness_directors(g['csr_dir'], g['diretores'], top_n=TOP_N, sample=100, seed=42, plot=False)
+        return _tabela('TOP 10 DIRETORES POR BETWEENNESS', pares, 'betweenness', arquivo('top_betweenness_diretores.csv'))
+
+    def proximidade_diretores(g):
+        pares = top_closeness_directors(g['csr_dir'], g['diretores'], top_n=TOP_N, plot=False, max_workers=max_workers)
+        return _tabela('TOP 10 DIRETORES POR CLOSENESS', pares, 'closeness', arquivo('top_closeness_diretores.csv'))
+
+    def mst(g):
+        exemplo = next(iter(g['und'].lista_adj), None)
+        if exemplo is None:
+            return 'MST: grafo vazio.'
+        arestas, custo = prim_mst_for_vertex(g['csr_und'], exemplo)
+        pd.DataFrame(arestas, columns=['u', 'v', 'peso']).to_csv(arquivo('mst.csv'), index=False)
+        return f"MST a partir de {exemplo}: custo={custo}, arestas={len(arestas)}"
+
+    secoes = ['resumo', 'componentes', 'histograma_graus', 'top_grau_atores', 'top_grau_diretores',
+              'intermediacao_atores', 'proximidade_atores', 'intermediacao_diretores',
+              'proximidade_diretores', 'mst']
+
+    def relatorio(*textos):
+        with open(arquivo('relatorio.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n\n'.join(textos) + '\n')
+        return arquivo('relatorio.txt')
+
+    return [
+        Tarefa('grafos', lambda: construir_grafos(caminho_csv)),
+        Tarefa('resumo', resumo, ['grafos']),
+        Tarefa('componentes', componentes, ['grafos']),
+        Tarefa('graus', graus, ['grafos']),
+        Tarefa('histograma_graus', histograma_graus, ['graus']),
+        Tarefa('top_grau_atores', top_grau_atores, ['graus']),
+        Tarefa('top_grau_diretores', top_grau_diretores, ['grafos', 'graus']),
+        Tarefa('intermediacao_atores', intermediacao_atores, ['grafos']),
+        Tarefa('proximidade_atores', proximidade_atores, ['grafos']),
+        Tarefa('intermediacao_diretores', intermediacao_diretores, ['grafos']),
+        Tarefa('proximidade_diretores', proximidade_diretores, ['grafos']),
+        Tarefa('mst', mst, ['grafos']),
+        Tarefa('relatorio', relatorio, secoes),
+    ]
+
+
+def main():
+    caminho_csv = sys.argv[1] if len(sys.argv) > 1 else 'dados/netflix_amazon_disney_titles.csv'
+    saida = sys.argv[2] if len(sys.argv) > 2 else 'relatorio'
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    os.makedirs(saida, exist_ok=True)
+
+    print("=" * 70)
+    print("RELATÓRIO COMPLETO")
+    print("=" * 70)
+    tarefas = criar_tarefas(caminho_csv, saida, max_workers)
+    inicio = time.perf_counter()
+    resultados, tempos, erros = executar_tarefas(tarefas, max_workers=max_workers)
+    total = time.perf_counter() - inicio
+
+    print(f"\n{'Tarefa':<28} {'Tempo (s)':>10}")
+    print("-" * 40)
+    for tarefa in tarefas:
+        if tarefa.nome in tempos:
+            print(f"{tarefa.nome:<28} {tempos[tarefa.nome]:>10.2f}")
+        else:
+            print(f"{tarefa.nome:<28} {'falhou':>10}  ({erros[tarefa.nome]})")
+    duracao, cadeia = caminho_critico(tarefas, tempos)
+    print("-" * 40)
+    print(f"Tempo total: {total:.2f}s; caminho crítico ({duracao:.2f}s): {' -> '.join(cadeia)}")
+    if 'relatorio' in resultados:
+        print(f"\nRelatório salvo em '{resultados['relatorio']}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,8 @@ from analise_rede.algoritmos import (
     prim_mst_for_vertex,
     degree_centrality,
     closeness_centrality,
-    approx_betweenness_centrality
 )
+from analise_rede.intermediacao import SessaoIntermediacao
 
 def main():
     caminho_csv = 'dados/netflix_amazon_disney_titles.csv'
@@ -40,7 +40,7 @@ def main():
 # A função agora retorna (contagem, lista_de_tamanhos).
 # Usamos '_' para indicar que vamos ignorar o segundo valor (a lista).
     scc_count, _ = count_strongly_connected_components(grafo_dir.lista_adj)
-    cc_count, _  = count_connected_components(grafo_und.lista_adj)
+    cc_count, _  = count_connected_components(grafo_und.obter_csr())
     print(f"\nComponentes fortemente conexas: {scc_count}")
     print(f"Componentes conexas:               {cc_count}")
 
@@ -69,14 +69,17 @@ def main():
     print(f"Degree Centrality (Ator):    {deg_ato:.6f}")
 
     # 7) Atividade 6: Closeness Centrality (rápido)
-    clo_dir = closeness_centrality(grafo_dir.lista_adj, exemplo_dir)
-    clo_ato = closeness_centrality(grafo_und.lista_adj, exemplo_ator)
+    clo_dir = closeness_centrality(grafo_dir.obter_csr(), exemplo_dir)
+    clo_ato = closeness_centrality(grafo_und.obter_csr(), exemplo_ator)
     print(f"\nCloseness Centrality (Diretor): {clo_dir:.6f}")
     print(f"Closeness Centrality (Ator):    {clo_ato:.6f}")
 
-    # 8) Atividade 5: Betweenness aproximado
-    btw_dir = approx_betweenness_centrality(grafo_dir.lista_adj, exemplo_dir, k=100)
-    btw_ato = approx_betweenness_centrality(grafo_und.lista_adj, exemplo_ator, k=100)
+    # 8) Atividade 5: Betweenness aproximado (uma sessão por grafo; as 100 fontes
+    # amostradas são processadas uma vez e ficam em cache entre execuções)
+    sessao_dir = SessaoIntermediacao(grafo_dir.obter_csr(), k=100, diretorio_cache='cache')
+    sessao_und = SessaoIntermediacao(grafo_und.obter_csr(), k=100, diretorio_cache='cache')
+    btw_dir = sessao_dir.intermediacao(exemplo_dir)
+    btw_ato = sessao_und.intermediacao(exemplo_ator)
     print(f"\nBetweenness (apx) Diretor: {btw_dir:.6f}")
     print(f"Betweenness (apx) Ator:    {btw_ato:.6f}")
 